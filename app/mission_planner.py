@@ -196,6 +196,8 @@ class MissionPlanner:
         self.retry = 0
         self.xml_valid = False
         self.ltl_valid = False
+        # mission XML kept in memory so callers can skip re-reading the file
+        self.last_xml: str | None = None
 
     # TODO stream response
     def run(self, prompt: str) -> None:
@@ -224,6 +226,7 @@ class MissionPlanner:
                     continue
                 # store file for logs
                 file_xml_out = write_out_file(self.log_directory, xml_out)
+                self.last_xml = xml_out
                 self.logger.debug(f"Wrote out temp XML file: {file_xml_out}")
                 self.xml_valid = True
             if not self.ltl_valid and self.ltl:
@@ -1,9 +1,14 @@
+import asyncio
+import os
 import socket
 import logging
 import struct
 import json
 from typing import Optional, Any
 
+# compiled once; shared by every frame we emit
+_U32 = struct.Struct("!I")
+
 
 class NetworkInterface:
     def __init__(self, logger: logging.Logger, host="127.0.0.1", port=12345):
@@ -24,8 +29,14 @@ class NetworkInterface:
 
     def _send_length_prefixed_data(self, data: bytes) -> None:
         """Send data with 4-byte length prefix."""
-        length = struct.pack("!I", len(data))  # 4-byte big-endian unsigned int
-        self.client_socket.sendall(length + data)
+        header = _U32.pack(len(data))  # 4-byte big-endian unsigned int
+        # scatter-gather: the kernel coalesces prefix and payload into one
+        # write without us concatenating (and copying) the buffers first
+        sent = self.client_socket.sendmsg([header, data])
+        remaining = 4 + len(data) - sent
+        if remaining > 0:
+            # rare partial send; fall back to copying just the tail
+            self.client_socket.sendall((header + data)[sent:])
 
     def send_xml_file(self, file_path: str) -> None:
         """Send XML file with length prefix."""
@@ -53,5 +64,70 @@ class NetworkInterface:
         if tree_points is not None:
             self.send_tree_points(tree_points)
 
+    def send_bytes(
+        self, data: bytes, tree_points: Optional[dict[str, Any]] = None
+    ) -> None:
+        """Send an in-memory XML buffer and optional tree points.
+
+        Same wire format as send_file, for callers that already hold the
+        document in memory and should not re-read it from disk.
+        """
+        self._send_length_prefixed_data(data)
+        self.logger.debug(f"XML buffer sent successfully ({len(data)} bytes).")
+        if tree_points is not None:
+            self.send_tree_points(tree_points)
+
+    async def send_bytes_async(
+        self, data: bytes, tree_points: Optional[dict[str, Any]] = None
+    ) -> None:
+        """Async counterpart of send_bytes; opens its own connection."""
+        _, writer = await asyncio.open_connection(self.host, self.port)
+        try:
+            writer.write(_U32.pack(len(data)) + data)
+            await writer.drain()
+            self.logger.debug(f"XML buffer sent successfully ({len(data)} bytes).")
+
+            if tree_points is not None:
+                json_data = json.dumps(tree_points).encode("utf-8")
+                writer.write(_U32.pack(len(json_data)) + json_data)
+                await writer.drain()
+                tree_count = len(tree_points.get("trees", []))
+                self.logger.debug(
+                    f"Tree points sent successfully ({tree_count} trees, {len(json_data)} bytes)."
+                )
+        finally:
+            writer.close()
+            await writer.wait_closed()
+
+    async def send_file_async(
+        self, file_path: str, tree_points: Optional[dict[str, Any]] = None
+    ) -> None:
+        """Send XML file (zero-copy via sendfile) and optional tree points.
+
+        Opens its own connection so it never blocks the caller's event loop;
+        the wire format matches send_file.
+        """
+        loop = asyncio.get_running_loop()
+        _, writer = await asyncio.open_connection(self.host, self.port)
+        try:
+            xml_size = os.path.getsize(file_path)
+            writer.write(_U32.pack(xml_size))
+            await writer.drain()
+            with open(file_path, "rb") as file:
+                await loop.sendfile(writer.transport, file)
+            self.logger.debug(f"XML file sent successfully ({xml_size} bytes).")
+
+            if tree_points is not None:
+                json_data = json.dumps(tree_points).encode("utf-8")
+                writer.write(_U32.pack(len(json_data)) + json_data)
+                await writer.drain()
+                tree_count = len(tree_points.get("trees", []))
+                self.logger.debug(
+                    f"Tree points sent successfully ({tree_count} trees, {len(json_data)} bytes)."
+                )
+        finally:
+            writer.close()
+            await writer.wait_closed()
+
     def close_socket(self) -> None:
         self.client_socket.close()
@@ -123,17 +123,13 @@ class TreePlacementGenerator:
 
     def _build_local_geometry(self) -> Tuple[Polygon, Dict[str, float]]:
         """Build local rotated polygon and transformation context."""
-        polygon_xy = [
-            self.coord_system.latlon_to_xy(lat, lon) for lon, lat in self.polygon_coords
-        ]
-        top_edge_start = self.polygon_coords[0]
-        top_edge_end = self.polygon_coords[1]
-
-        top_start_xy = self.coord_system.latlon_to_xy(
-            top_edge_start[1], top_edge_start[0]
+        # one vectorized pyproj call for every vertex instead of a Python
+        # call per point
+        xs, ys = self.coord_system.latlon_to_xy_many(
+            self.polygon_coords[:, 1], self.polygon_coords[:, 0]
         )
-        top_end_xy = self.coord_system.latlon_to_xy(top_edge_end[1], top_edge_end[0])
-        rotation_info = self._calculate_rotation(top_start_xy, top_end_xy)
+        polygon_xy = list(zip(xs, ys))
+        rotation_info = self._calculate_rotation((xs[0], ys[0]), (xs[1], ys[1]))
         poly_local = self._transform_polygon_to_local(polygon_xy, rotation_info)
         return poly_local, rotation_info
 
@@ -153,55 +149,61 @@ class TreePlacementGenerator:
             coords[3],
         )
 
-        rows = len(trees_per_row)
-        tree_points: List[Dict[str, Any]] = []
-        tree_counter = 1
-        positions: Dict[Tuple[int, int], Tuple[float, float, int]] = {}
-
-        for row_index, num_trees in enumerate(trees_per_row):
-            t = row_index / (rows - 1) if rows > 1 else 0
-
-            row_start_x = (1 - t) * top_left[0] + t * bottom_left[0]
-            row_start_y = (1 - t) * top_left[1] + t * bottom_left[1]
-            row_end_x = (1 - t) * top_right[0] + t * bottom_right[0]
-            row_end_y = (1 - t) * top_right[1] + t * bottom_right[1]
-
-            for col_index in range(num_trees):
-                u = col_index / (num_trees - 1) if num_trees > 1 else 0.5
-                x = (1 - u) * row_start_x + u * row_end_x
-                y = (1 - u) * row_start_y + u * row_end_y
+        counts = np.asarray(trees_per_row, dtype=np.int64)
+        rows = counts.shape[0]
+        n_trees = int(counts.sum())
+        if n_trees == 0:
+            return []
+
+        # flat row/col indices for every tree, row-major, all in numpy
+        row_idx = np.repeat(np.arange(rows), counts)
+        row_starts = np.cumsum(counts) - counts
+        col_idx = np.arange(n_trees) - np.repeat(row_starts, counts)
+        counts_rep = counts[row_idx]
+
+        t = row_idx / (rows - 1) if rows > 1 else np.zeros(n_trees)
+        u = np.where(counts_rep > 1, col_idx / np.maximum(counts_rep - 1, 1), 0.5)
+
+        row_start_x = (1 - t) * top_left[0] + t * bottom_left[0]
+        row_start_y = (1 - t) * top_left[1] + t * bottom_left[1]
+        row_end_x = (1 - t) * top_right[0] + t * bottom_right[0]
+        row_end_y = (1 - t) * top_right[1] + t * bottom_right[1]
+
+        xs_local = (1 - u) * row_start_x + u * row_end_x
+        ys_local = (1 - u) * row_start_y + u * row_end_y
+
+        # column-adjacent trees sit next to each other in the flat order,
+        # so midpoint pairs are the consecutive indices that share a row
+        if n_trees > 1:
+            pair_first = np.flatnonzero(row_idx[:-1] == row_idx[1:])
+        else:
+            pair_first = np.empty(0, dtype=np.int64)
+        mid_xs = (xs_local[pair_first] + xs_local[pair_first + 1]) / 2
+        mid_ys = (ys_local[pair_first] + ys_local[pair_first + 1]) / 2
+
+        # all trees and midpoints go back to lat/lon in one inverse call
+        lats, lons = self._transform_to_global_coords_many(
+            np.concatenate([xs_local, mid_xs]),
+            np.concatenate([ys_local, mid_ys]),
+            rotation_info,
+        )
 
-                lat, lon = self._transform_to_global_coords(x, y, rotation_info)
-                tree_points.append(
-                    {
-                        "tree_index": tree_counter,
-                        "row": row_index + 1,
-                        "col": col_index + 1,
-                        "lat": lat,
-                        "lon": lon,
-                        "row_waypoints": [],
-                    }
-                )
-                positions[(row_index, col_index)] = (
-                    x,
-                    y,
-                    len(tree_points) - 1,
-                )
-                tree_counter += 1
+        tree_points: List[Dict[str, Any]] = [
+            {
+                "tree_index": i + 1,
+                "row": int(row_idx[i]) + 1,
+                "col": int(col_idx[i]) + 1,
+                "lat": float(lats[i]),
+                "lon": float(lons[i]),
+                "row_waypoints": [],
+            }
+            for i in range(n_trees)
+        ]
 
-        for (row_idx, col_idx), (x, y, idx) in positions.items():
-            next_col_key = (row_idx, col_idx + 1)
-            if next_col_key not in positions:
-                continue
-            next_x, next_y, next_idx = positions[next_col_key]
-            midpoint_x = (x + next_x) / 2
-            midpoint_y = (y + next_y) / 2
-            midpoint_lat, midpoint_lon = self._transform_to_global_coords(
-                midpoint_x, midpoint_y, rotation_info
-            )
-            midpoint = (midpoint_lat, midpoint_lon)
+        for j, idx in enumerate(pair_first.tolist()):
+            midpoint = (float(lats[n_trees + j]), float(lons[n_trees + j]))
             tree_points[idx]["row_waypoints"].append(midpoint)
-            tree_points[next_idx]["row_waypoints"].append(midpoint)
+            tree_points[idx + 1]["row_waypoints"].append(midpoint)
 
         return tree_points
 
@@ -240,8 +242,8 @@ class TreePlacementGenerator:
         theta = math.atan2(dy, dx)
 
         return {
-            "cos_a": np.cos(-theta),
-            "sin_a": np.sin(-theta),
+            "cos_a": math.cos(-theta),
+            "sin_a": math.sin(-theta),
             "origin_x": start_point[0],
             "origin_y": start_point[1],
         }
@@ -252,22 +254,13 @@ class TreePlacementGenerator:
         """Transform polygon coordinates to local rotated coordinate system."""
         cos_a = rotation_info["cos_a"]
         sin_a = rotation_info["sin_a"]
-        origin_x = rotation_info["origin_x"]
-        origin_y = rotation_info["origin_y"]
 
-        poly_local_coords = []
-        for x, y in polygon_xy:
-            # Translate to origin
-            x_shifted = x - origin_x
-            y_shifted = y - origin_y
+        # translate then rotate all vertices in one matmul
+        xy = np.asarray(polygon_xy, dtype=np.float64)
+        shifted = xy - (rotation_info["origin_x"], rotation_info["origin_y"])
+        rotation = np.array([[cos_a, sin_a], [-sin_a, cos_a]])
 
-            # Rotate
-            x_rot = cos_a * x_shifted - sin_a * y_shifted
-            y_rot = sin_a * x_shifted + cos_a * y_shifted
-
-            poly_local_coords.append((x_rot, y_rot))
-
-        return Polygon(poly_local_coords)
+        return Polygon(shifted @ rotation)
 
     def _interpolate_point(
         self,
@@ -382,6 +375,21 @@ class TreePlacementGenerator:
             return (top_left, bottom_left), (top_right, bottom_right)
         return (top_left, top_right), (bottom_left, bottom_right)
 
+    def _transform_to_global_coords_many(
+        self,
+        xs: np.ndarray,
+        ys: np.ndarray,
+        rotation_info: Dict[str, float],
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Transform arrays of local coordinates back to global lat/lon."""
+        cos_a = rotation_info["cos_a"]
+        sin_a = rotation_info["sin_a"]
+
+        x_global = cos_a * xs + sin_a * ys + rotation_info["origin_x"]
+        y_global = -sin_a * xs + cos_a * ys + rotation_info["origin_y"]
+
+        return self.coord_system.xy_to_latlon_many(x_global, y_global)
+
     def _transform_to_global_coords(
         self, x: float, y: float, rotation_info: Dict[str, float]
     ) -> Tuple[float, float]:
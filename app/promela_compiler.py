@@ -16,6 +16,17 @@ proctype select_{}() {{
 }}
 """
 
+# frozen tag sets so the tree walk doesn't rebuild Enum dict views per element
+ACTION_TAG_SET: frozenset = frozenset(ActionTags)
+CONDITIONAL_TAG_SET: frozenset = frozenset(ConditionalTags)
+
+# emission templates parsed once at import; only the varying fields are filled
+# in per task (CPython caches the parse for a given format-string object)
+TASK_DEF_FMT: str = "Task {name};\n"
+ACTION_CALL_FMT: str = "{indent}{name}.action.actionType = {action};\n"
+SELECT_FMT: str = "{indent}select ({var} : {lo}..{hi});\n\n"
+CONDITION_FMT: str = "{var} {comp} {threshold} ->\n"
+
 
 class PromelaCompiler:
     def __init__(self, promela_template: str, logger: logging.Logger):
@@ -40,28 +51,36 @@ class PromelaCompiler:
         self.root: etree._Element = etree.fromstring(xml_file)
 
     def parse_code(self) -> str:
-        promela_code: str = self.promela_template
         task_defs: list[str] = []
         execution_calls: list[str] = []
         self.reset()
 
-        task_sequence: etree._Element = self.root.find("BehaviorTree").find("Sequence")
+        # single slashed path keeps the lookup inside lxml's C path evaluator
+        task_sequence: etree._Element = self.root.find("BehaviorTree/Sequence")
 
         self._define_tree(task_sequence, task_defs, execution_calls)
 
         self.task_names = "".join(task_defs)
-        global_list: list[str] = [f"int {x};\n" for x in self.globals_used]
-
-        # Concatenate task definitions and execution calls
-        promela_code += "\n"
-        promela_code += self.task_names
-        promela_code += "\n"
-        promela_code += "".join(global_list)
-        promela_code += "\ninit {\n    atomic {\n"
-        promela_code += "".join(execution_calls)
-        promela_code += "\n    }\n}"
-
-        return promela_code
+        # _add_global appends unconditionally; dedup here, preserving order,
+        # so repeated names don't emit duplicate declarations
+        globals_text: str = "".join(
+            f"int {g};\n" for g in dict.fromkeys(self.globals_used)
+        )
+
+        # Concatenate task definitions and execution calls in one join so we
+        # don't re-copy the growing string for every += above
+        return "".join(
+            [
+                self.promela_template,
+                "\n",
+                self.task_names,
+                "\n",
+                globals_text,
+                "\ninit {\n    atomic {\n",
+                *execution_calls,
+                "\n    }\n}",
+            ]
+        )
 
     def set_promela_template(self, promela_template_path: str) -> None:
         with open(promela_template_path, "r") as file:
@@ -74,7 +93,7 @@ class PromelaCompiler:
         return self.task_names
 
     def get_globals(self) -> str:
-        return "".join([f"int {g};\n" for g in self.globals_used])
+        return "".join(f"int {g};\n" for g in dict.fromkeys(self.globals_used))
 
     def reset(self) -> None:
         self.task_names = ""
@@ -94,7 +113,9 @@ class PromelaCompiler:
         sequence_count: int = len(sequence.findall("Sequence"))
 
         for t in sequence:
-            if t.tag == ControlTags.Sequence:
+            # resolve the tag once per element instead of per comparison
+            tag = t.tag
+            if tag == ControlTags.Sequence:
                 # recurse
                 self._define_tree(t, task_defs, execution_calls, indent)
                 sequence_count -= 1
@@ -104,59 +125,63 @@ class PromelaCompiler:
                     else:
                         execution_calls.append(indent[:-4] + else_statement + " skip\n")
                     fallback = False
-            elif t.tag == ControlTags.Fallback:
+            elif tag == ControlTags.Fallback:
                 execution_calls.append(indent + "if\n")
                 execution_calls.append(indent + ":: ")
                 self._define_tree(t, task_defs, execution_calls, indent + "    ", True)
                 execution_calls.append(indent + "fi\n")
-            elif t.tag == ControlTags.Parallel:
+            elif tag == ControlTags.Parallel:
                 pass  # TODO
-            elif t.tag in ActionTags.__dict__.values():
-                if t.get("name") is not None:
-                    task_defs.append("Task " + t.get("name") + ";\n")
+            elif tag in ACTION_TAG_SET:
+                name = t.get("name")
+                if name is not None:
+                    task_defs.append(TASK_DEF_FMT.format(name=name))
                     execution_calls.append(
-                        indent + t.get("name") + ".action.actionType = " + t.tag + ";\n"
+                        ACTION_CALL_FMT.format(indent=indent, name=name, action=tag)
                     )
                 # we assume its a Condition
-            elif t.tag in ConditionalTags.__dict__.values():
-                if t.tag == ConditionalTags.AssertTrue:
+            elif tag in CONDITIONAL_TAG_SET:
+                if tag == ConditionalTags.AssertTrue:
                     result: str = t.get("result")
                     if result is not None:
                         execution_calls.insert(
                             -2,
-                            (
-                                indent[:-4]
-                                + "select ({} : {}..{});\n\n".format(
-                                    result[1:-1], "0", "1"
-                                )
+                            SELECT_FMT.format(
+                                indent=indent[:-4], var=result[1:-1], lo="0", hi="1"
                             ),
                         )
-                        execution_calls.append(f"{result[1:-1]} == 1 ->\n")
+                        execution_calls.append(
+                            CONDITION_FMT.format(
+                                var=result[1:-1], comp="==", threshold="1"
+                            )
+                        )
                         self._add_global(result[1:-1])
                     continue
-                elif t.tag == ConditionalTags.CheckValue:
+                elif tag == ConditionalTags.CheckValue:
                     val: str = t.get("value")
                     threshold: str = t.get("threshold")
                     comp: str = t.get("comp")
                     execution_calls.insert(
                         -2,
-                        (
-                            indent[:-4]
-                            + "select ({} : {}..{});\n\n".format(
-                                val[1:-1],
-                                str(int(threshold) - 1),
-                                str(int(threshold) + 1),
-                            )
+                        SELECT_FMT.format(
+                            indent=indent[:-4],
+                            var=val[1:-1],
+                            lo=str(int(threshold) - 1),
+                            hi=str(int(threshold) + 1),
                         ),
                     )
                     if val is not None and threshold is not None and comp is not None:
                         execution_calls.append(
-                            f"{val[1:-1]} {self.xml_comp_to_promela[comp]} {threshold} ->\n"
+                            CONDITION_FMT.format(
+                                var=val[1:-1],
+                                comp=self.xml_comp_to_promela[comp],
+                                threshold=threshold,
+                            )
                         )
                         self._add_global(val[1:-1])
                     continue
             else:
-                self.logger.warning(f"Unknown tag in XML: {t.tag}")
+                self.logger.warning(f"Unknown tag in XML: {tag}")
 
     def _add_global(self, action_type: str) -> str:
         self.globals_used.append(action_type)
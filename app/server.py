@@ -1,20 +1,31 @@
 import os
+import asyncio
 import logging
 import tempfile
 import shutil
 import time
-import json
 import uuid
 import yaml
+import hashlib
 import mimetypes
-import subprocess
-import struct
+import types
+import mmap
 import re
-import xml.etree.ElementTree as ET
-from typing import Any
-
+import queue
+import threading
+from concurrent.futures import Future
+from dataclasses import dataclass
+from functools import lru_cache
+from io import BytesIO
+from typing import Any, Iterator
+
+import anyio
+import numpy as np
+import orjson
+from lxml import etree
 from pathlib import Path
 from fastapi import FastAPI, File, UploadFile, Form, Body, Request
+from fastapi import Response
 from fastapi.responses import StreamingResponse, HTMLResponse
 from fastapi.staticfiles import StaticFiles
 from fastapi.middleware.cors import CORSMiddleware
@@ -122,6 +133,97 @@ if farm_polygon_from_file:
         )
     farm_cfg["polygon"] = farm_polygon_from_file
 
+
+def _resolve_model_routing() -> ModelRoutingConfig:
+    """Collapse llm.routing + llm.endpoints into one immutable config."""
+    routing_mode = str(routing_cfg.get("mode", "online")).lower()
+    online_model = str(routing_cfg["online_model"])
+    offline_model = routing_cfg.get("offline_model")
+    online_api_base = endpoints_cfg.get("online_api_base")
+    offline_api_base = endpoints_cfg.get("offline_api_base")
+
+    if routing_mode == "auto":
+        return ModelRoutingConfig(
+            model=online_model,
+            api_base=online_api_base,
+            auto_model_toggle=True,
+            local_model=offline_model,
+            local_api_base=offline_api_base,
+        )
+    if routing_mode == "online":
+        return ModelRoutingConfig(
+            model=online_model,
+            api_base=online_api_base,
+            auto_model_toggle=False,
+            local_model=None,
+            local_api_base=None,
+        )
+    if routing_mode == "offline":
+        if offline_model is None:
+            logger.warning(
+                "llm.routing.mode=offline but no offline_model provided. Falling back to online_model."
+            )
+        return ModelRoutingConfig(
+            model=offline_model or online_model,
+            api_base=offline_api_base,
+            auto_model_toggle=False,
+            local_model=None,
+            local_api_base=None,
+        )
+    raise ValueError(
+        "Invalid llm.routing.mode '%s'. Supported values: auto, online, offline"
+        % routing_mode
+    )
+
+
+@dataclass(frozen=True, slots=True)
+class ServerConfig:
+    """Static per-process planner settings, derived from the YAML once."""
+
+    token_path: str
+    lint_xml: bool
+    context_files: tuple[str, ...]
+    max_retries: int
+    max_tokens: int
+    temperature: float
+    ltl: bool
+    pml_template_path: str
+    spin_path: str
+    log_directory: str
+    model_routing: ModelRoutingConfig
+    tcp_host: str
+    tcp_port: int
+
+
+def _build_server_config() -> ServerConfig:
+    ltl = bool(validation_cfg.get("ltl_enabled", False))
+    pml_template_path = str(verification_cfg.get("promela_template", ""))
+    spin_path = str(verification_cfg.get("spin_path", ""))
+    if ltl and not (pml_template_path and spin_path):
+        ltl = False
+        logger.warning(
+            "No spin configuration found. Proceeding without formal verification..."
+        )
+
+    return ServerConfig(
+        token_path=config_yaml["auth"]["token_env_file"],
+        lint_xml=bool(validation_cfg.get("lint_xml", True)),
+        context_files=tuple(mission_cfg.get("context_files", [])),
+        max_retries=int(planner_cfg["retries"]["max"]),
+        max_tokens=int(generation_cfg["max_tokens"]),
+        temperature=float(generation_cfg["temperature"]),
+        ltl=ltl,
+        pml_template_path=pml_template_path,
+        spin_path=spin_path,
+        log_directory=mission_cfg["log_directory"],
+        model_routing=_resolve_model_routing(),
+        tcp_host=str(network_cfg.get("host", "127.0.0.1")),
+        tcp_port=int(network_cfg.get("port", 12345)),
+    )
+
+
+SERVER_CONFIG = _build_server_config()
+
 logging_level = config_yaml.get("logging", {}).get("level", "INFO")
 logging.getLogger().setLevel(logging._nameToLevel.get(logging_level, logging.INFO))
 logger.setLevel(logging._nameToLevel.get(logging_level, logging.INFO))
@@ -145,23 +247,169 @@ class GenerateRequest(BaseModel):
     text: str | None
 
 
+REQUEST_LOG_DIR = Path("logs")
+REQUEST_LOG_DIR.mkdir(exist_ok=True)
+REQUEST_LOG_PATH = REQUEST_LOG_DIR / "requests.log"
+
 _openai_client = None
+_openai_client_lock = threading.Lock()
 _whisper_model = None
+_whisper_pipeline = None
+_whisper_queue: queue.Queue | None = None
+_whisper_thread: threading.Thread | None = None
+_whisper_lock = threading.Lock()
 
-CONTENT_TYPE_EXTENSION_MAP: dict[str, str] = {
-    "audio/webm": ".webm",
-    "video/webm": ".webm",
-    "audio/mp4": ".m4a",
-    "audio/m4a": ".m4a",
-    "audio/aac": ".aac",
-    "audio/x-m4a": ".m4a",
-    "audio/wav": ".wav",
-    "audio/x-wav": ".wav",
-    "audio/mpeg": ".mp3",
-    "video/quicktime": ".mov",
-    "audio/3gpp": ".3gp",
-    "audio/x-caf": ".caf",
-}
+_req_log_queue: queue.Queue | None = None
+_req_log_thread: threading.Thread | None = None
+_req_log_lock = threading.Lock()
+
+
+def _request_log_worker() -> None:
+    """Append queued log entries with one long-lived buffered handle."""
+    assert _req_log_queue is not None
+    with open(REQUEST_LOG_PATH, "ab", buffering=1 << 16) as f:
+        while True:
+            entry = _req_log_queue.get()
+            f.write(orjson.dumps(entry) + b"\n")
+            # drain whatever piled up before paying the flush
+            while True:
+                try:
+                    entry = _req_log_queue.get_nowait()
+                except queue.Empty:
+                    break
+                f.write(orjson.dumps(entry) + b"\n")
+            f.flush()
+
+
+def _enqueue_request_log(entry: dict[str, Any]) -> None:
+    """Hand a log entry to the writer thread; never touches disk itself."""
+    global _req_log_queue, _req_log_thread
+    with _req_log_lock:
+        if _req_log_thread is None:
+            _req_log_queue = queue.Queue()
+            _req_log_thread = threading.Thread(
+                target=_request_log_worker, name="request-log-writer", daemon=True
+            )
+            _req_log_thread.start()
+    assert _req_log_queue is not None
+    _req_log_queue.put(entry)
+
+
+# compiled once; matched per MoveToTreeID element on every mission read
+_TREE_ID_RE = re.compile(r"(\d+)")
+
+# directory listings keyed by mtime signature so polling endpoints don't
+# re-walk unchanged directories on every hit
+_scan_cache: dict[str, tuple[int, Any]] = {}
+# parsed mission request JSON keyed by (path -> mtime_ns, data)
+_mission_request_cache: dict[str, tuple[int, Any]] = {}
+# in-flight background sends; holding a reference keeps the tasks alive
+_background_tasks: set = set()
+
+# TreePlacementGenerator instances keyed by canonical polygon JSON; the
+# generator is deterministic per polygon, so instances are reusable and
+# this skips rebuilding PROJ transformers and polygon geometry per request
+_tpg_cache: dict[bytes, TreePlacementGenerator] = {}
+
+
+def _get_tree_placement_generator(farm_polygon: dict) -> TreePlacementGenerator:
+    key = orjson.dumps(farm_polygon, option=orjson.OPT_SORT_KEYS)
+    tpg = _tpg_cache.get(key)
+    if tpg is None:
+        tpg = TreePlacementGenerator(
+            farm_polygon["points"],
+            farm_polygon["dimensions"],
+            perimeter_margin_m=farm_polygon.get("perimeter_margin_m", 5.0),
+            traversal_axis=farm_polygon.get("traversal_axis", "row"),
+        )
+        _tpg_cache[key] = tpg
+    return tpg
+
+
+# warm the cache for the configured farm polygon so the first /generate
+# skips PROJ setup and the polygon UTM conversion entirely
+_default_farm_polygon = mission_cfg.get("farm", {}).get("polygon")
+if _default_farm_polygon:
+    try:
+        _get_tree_placement_generator(_default_farm_polygon)
+    except Exception as exc:
+        logger.warning("Could not pre-build tree placement generator: %s", exc)
+
+
+def _dir_tree_mtime_ns(root: Path) -> int:
+    """Newest mtime across root and its subdirectories.
+
+    Adding, removing, or renaming a file bumps its parent directory's
+    mtime, which is all the name listings below depend on.
+    """
+    newest = root.stat().st_mtime_ns
+    for dirpath, dirnames, _ in os.walk(root):
+        for name in dirnames:
+            try:
+                mtime = os.stat(os.path.join(dirpath, name)).st_mtime_ns
+            except OSError:
+                continue
+            if mtime > newest:
+                newest = mtime
+    return newest
+
+
+def _prompt_file_index() -> dict[str, list[Path]]:
+    """Map of file name -> full paths under PROMPTS_DIR, cached by tree mtime."""
+    signature = _dir_tree_mtime_ns(PROMPTS_DIR)
+    cached = _scan_cache.get("prompt_index")
+    if cached is not None and cached[0] == signature:
+        return cached[1]
+
+    index: dict[str, list[Path]] = {}
+    for dirpath, _, filenames in os.walk(PROMPTS_DIR):
+        for name in filenames:
+            index.setdefault(name, []).append(Path(dirpath) / name)
+    _scan_cache["prompt_index"] = (signature, index)
+    return index
+
+
+def _prompt_file_names() -> list[str]:
+    """Sorted unique file names under PROMPTS_DIR."""
+    return sorted(_prompt_file_index())
+
+
+def _schema_names() -> list[str]:
+    """Sorted schema stems from SCHEMAS_DIR, cached by directory mtime."""
+    signature = SCHEMAS_DIR.stat().st_mtime_ns
+    cached = _scan_cache.get("schemas")
+    if cached is not None and cached[0] == signature:
+        return cached[1]
+
+    with os.scandir(SCHEMAS_DIR) as entries:
+        names = sorted(
+            entry.name[: -len(".xsd")]
+            for entry in entries
+            if entry.is_file() and entry.name.endswith(".xsd")
+        )
+    _scan_cache["schemas"] = (signature, names)
+    return names
+
+
+# load the OS mime databases at import so the first upload doesn't pay it
+mimetypes.init()
+
+CONTENT_TYPE_EXTENSION_MAP: "types.MappingProxyType[str, str]" = types.MappingProxyType(
+    {
+        "audio/webm": ".webm",
+        "video/webm": ".webm",
+        "audio/mp4": ".m4a",
+        "audio/m4a": ".m4a",
+        "audio/aac": ".aac",
+        "audio/x-m4a": ".m4a",
+        "audio/wav": ".wav",
+        "audio/x-wav": ".wav",
+        "audio/mpeg": ".mp3",
+        "video/quicktime": ".mov",
+        "audio/3gpp": ".3gp",
+        "audio/x-caf": ".caf",
+    }
+)
 
 
 def _infer_audio_suffix(upload_file: UploadFile) -> str:
@@ -173,95 +421,65 @@ def _infer_audio_suffix(upload_file: UploadFile) -> str:
 
     if upload_file.content_type:
         content_type = upload_file.content_type.lower()
-        if content_type in CONTENT_TYPE_EXTENSION_MAP:
-            return CONTENT_TYPE_EXTENSION_MAP[content_type]
-        guessed = mimetypes.guess_all_extensions(content_type)
-        if guessed:
-            return guessed[0]
+        suffix = CONTENT_TYPE_EXTENSION_MAP.get(content_type)
+        if suffix is not None:
+            return suffix
+        # only consult the mimetypes tables for plausible media types
+        if content_type.startswith(("audio/", "video/")):
+            guessed = mimetypes.guess_all_extensions(content_type)
+            if guessed:
+                return guessed[0]
 
     return ".tmp"
 
 
-def _convert_to_mp3(source_path: str) -> str:
-    """Convert arbitrary audio file at source_path to mp3 if needed."""
-    if Path(source_path).suffix.lower() == ".mp3":
-        return source_path
-
-    if shutil.which("ffmpeg") is None:
-        logger.warning(
-            "ffmpeg not found; skipping conversion and using original audio file."
-        )
-        return source_path
-
-    fd, mp3_path = tempfile.mkstemp(suffix=".mp3")
-    os.close(fd)
-    command = [
-        "ffmpeg",
-        "-y",
-        "-loglevel",
-        "error",
-        "-i",
-        source_path,
-        "-vn",
-        "-codec:a",
-        "libmp3lame",
-        "-q:a",
-        "2",
-        mp3_path,
-    ]
-    try:
-        subprocess.run(
-            command, check=True, stdout=subprocess.PIPE, stderr=subprocess.PIPE
-        )
-    except FileNotFoundError as exc:
-        logger.error("ffmpeg not found while converting audio: %s", exc)
-        os.remove(mp3_path)
-        return source_path
-    except subprocess.CalledProcessError as exc:
-        stderr = exc.stderr.decode("utf-8", errors="ignore") if exc.stderr else ""
-        logger.error("ffmpeg conversion failed: %s", stderr.strip())
-        os.remove(mp3_path)
-        return source_path
-
-    return mp3_path
-
-
-def _read_length_prefixed_chunks(file_path: Path) -> list[bytes]:
-    chunks: list[bytes] = []
+def _read_length_prefixed_chunks(file_path: Path) -> Iterator[memoryview]:
+    """Yield zero-copy payload slices from a length-prefixed .bin file."""
     with open(file_path, "rb") as f:
-        while True:
-            header = f.read(4)
-            if len(header) < 4:
-                break
-            length = struct.unpack("!I", header)[0]
-            if length <= 0:
-                break
-            payload = f.read(length)
-            if len(payload) < length:
-                break
-            chunks.append(payload)
-    return chunks
+        try:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # empty files cannot be mapped
+            return
+
+    # slices reference the mapping directly; it is closed once the last
+    # yielded view is garbage collected
+    mv = memoryview(mm)
+    offset = 0
+    end = len(mv)
+    while offset + 4 <= end:
+        length = int.from_bytes(mv[offset : offset + 4], "big")
+        offset += 4
+        if length <= 0 or offset + length > end:
+            break
+        yield mv[offset : offset + length]
+        offset += length
 
 
 def _extract_move_to_tree_ids(xml_text: str) -> list[int]:
+    ids: list[int] = []
     try:
-        root = ET.fromstring(xml_text)
-    except ET.ParseError:
+        # pull-parse only MoveToTreeID elements and free them as we go so the
+        # full tree never materializes for large mission XMLs
+        for _, elem in etree.iterparse(
+            BytesIO(xml_text.encode("utf-8")), events=("end",), tag="MoveToTreeID"
+        ):
+            raw_id = elem.get("id")
+            if raw_id is None:
+                name = elem.get("name") or ""
+                match = _TREE_ID_RE.search(name)
+                raw_id = match.group(1) if match else None
+            elem.clear()
+            while elem.getprevious() is not None:
+                del elem.getparent()[0]
+            if raw_id is None:
+                continue
+            try:
+                ids.append(int(raw_id))
+            except ValueError:
+                continue
+    except etree.XMLSyntaxError:
         return []
-
-    ids: list[int] = []
-    for elem in root.findall(".//MoveToTreeID"):
-        raw_id = elem.get("id")
-        if raw_id is None:
-            name = elem.get("name") or ""
-            match = re.search(r"(\d+)", name)
-            raw_id = match.group(1) if match else None
-        if raw_id is None:
-            continue
-        try:
-            ids.append(int(raw_id))
-        except ValueError:
-            continue
     return ids
 
 
@@ -279,79 +497,119 @@ def _get_tree_entries(tree_points: Any) -> list[dict[str, Any]]:
 
 
 def _build_tree_points_payload(tree_points: Any) -> list[dict[str, float]]:
-    payload: list[dict[str, float]] = []
-    for item in _get_tree_entries(tree_points):
-        if "lat" not in item or "lon" not in item:
-            continue
-        try:
-            payload.append({"lat": float(item["lat"]), "lon": float(item["lon"])})
-        except (TypeError, ValueError):
-            continue
-    return payload
+    entries = [
+        item
+        for item in _get_tree_entries(tree_points)
+        if "lat" in item and "lon" in item
+    ]
+    if not entries:
+        return []
+
+    # convert the lat/lon columns in bulk; per-point float() loops dominate
+    # on large orchards
+    try:
+        lats = np.asarray([item["lat"] for item in entries], dtype=np.float64)
+        lons = np.asarray([item["lon"] for item in entries], dtype=np.float64)
+    except (TypeError, ValueError):
+        # rare malformed entry: fall back to filtering point by point
+        payload: list[dict[str, float]] = []
+        for item in entries:
+            try:
+                payload.append({"lat": float(item["lat"]), "lon": float(item["lon"])})
+            except (TypeError, ValueError):
+                continue
+        return payload
+
+    valid = np.isfinite(lats) & np.isfinite(lons)
+    return [
+        {"lat": lat, "lon": lon}
+        for lat, lon in zip(lats[valid].tolist(), lons[valid].tolist())
+    ]
 
 
 def _build_visit_points(tree_points: Any, move_ids: list[int]) -> list[dict[str, Any]]:
-    index_map = {}
+    indices: list[int] = []
+    lats: list[float] = []
+    lons: list[float] = []
     for item in _get_tree_entries(tree_points):
         try:
             tree_index = int(item.get("tree_index", item.get("treeIndex")))
         except (TypeError, ValueError):
             continue
         if "lat" in item and "lon" in item:
-            index_map[tree_index] = {
-                "lat": float(item["lat"]),
-                "lon": float(item["lon"]),
-            }
+            indices.append(tree_index)
+            lats.append(item["lat"])
+            lons.append(item["lon"])
 
-    visit_points = []
-    for order, tree_id in enumerate(move_ids, start=1):
-        coords = index_map.get(tree_id)
-        if not coords:
-            continue
-        visit_points.append(
-            {
-                "lat": coords["lat"],
-                "lon": coords["lon"],
-                "order": order,
-                "treeIndex": tree_id,
-            }
+    if not indices or not move_ids:
+        return []
+
+    # resolve all move ids against the tree indices in one vectorized pass;
+    # searchsorted side="right" keeps last-entry-wins for duplicate indices
+    idx_arr = np.fromiter(indices, dtype=np.int64, count=len(indices))
+    lat_arr = np.asarray(lats, dtype=np.float64)
+    lon_arr = np.asarray(lons, dtype=np.float64)
+    sort_order = np.argsort(idx_arr, kind="stable")
+    sorted_idx = idx_arr[sort_order]
+
+    move_arr = np.asarray(move_ids, dtype=np.int64)
+    pos = np.searchsorted(sorted_idx, move_arr, side="right") - 1
+    found = (pos >= 0) & (sorted_idx[np.maximum(pos, 0)] == move_arr)
+    rows = sort_order[pos[found]]
+    orders = np.arange(1, len(move_arr) + 1)[found]
+
+    return [
+        {
+            "lat": float(lat),
+            "lon": float(lon),
+            "order": int(order),
+            "treeIndex": int(tree_id),
+        }
+        for lat, lon, order, tree_id in zip(
+            lat_arr[rows], lon_arr[rows], orders, move_arr[found]
         )
-    return visit_points
+    ]
 
 
 def _extract_tree_points_from_bin(
     file_path: Path,
 ) -> tuple[list[dict[str, float]], list[dict[str, Any]]]:
+    """Extract tree/visit points from a .bin, cached while the file is unchanged."""
+    stat_result = file_path.stat()
+    return _extract_tree_points_from_bin_cached(
+        str(file_path), stat_result.st_mtime_ns, stat_result.st_size
+    )
+
+
+@lru_cache(maxsize=32)
+def _extract_tree_points_from_bin_cached(
+    path_str: str, mtime_ns: int, size: int
+) -> tuple[list[dict[str, float]], list[dict[str, Any]]]:
+    file_path = Path(path_str)
     xml_text = None
     tree_points = []
     full_tree_points: list[dict[str, Any]] = []
     for chunk in _read_length_prefixed_chunks(file_path):
-        try:
-            decoded = chunk.decode("utf-8")
-        except UnicodeDecodeError:
+        raw = chunk.tobytes()
+        # dispatch on the first non-whitespace byte instead of paying a full
+        # JSON parse failure for every XML chunk
+        first = next((b for b in raw[:16] if b not in b" \t\r\n"), None)
+        if first == 0x3C:  # '<'
+            try:
+                xml_text = raw.decode("utf-8")
+            except UnicodeDecodeError:
+                pass
+            continue
+        if first not in (0x5B, 0x7B):  # '[' or '{'
             continue
-
         try:
-            data = json.loads(decoded)
-        except json.JSONDecodeError:
-            if decoded.strip().startswith("<"):
-                xml_text = decoded
+            data = orjson.loads(raw)
+        except orjson.JSONDecodeError:
             continue
 
         if isinstance(data, dict) and isinstance(data.get("trees"), list):
-            points: list[dict[str, float]] = []
-            full_points: list[dict[str, Any]] = []
-            for item in data["trees"]:
-                if not isinstance(item, dict):
-                    continue
-                full_points.append(item)
-                if "lat" in item and "lon" in item:
-                    try:
-                        points.append(
-                            {"lat": float(item["lat"]), "lon": float(item["lon"])}
-                        )
-                    except (TypeError, ValueError):
-                        continue
+            full_points = [item for item in data["trees"] if isinstance(item, dict)]
+            points = _build_tree_points_payload(full_points)
             if points:
                 tree_points = points
                 full_tree_points = full_points
@@ -364,6 +622,64 @@ def _extract_tree_points_from_bin(
     return tree_points, visit_points
 
 
+def _save_tree_index(mission_dir: Path, mission_id: str, tree_points: Any) -> None:
+    """Persist tree coordinates as compact arrays for spatial lookups.
+
+    Saved next to the tree_points JSON so later range/nearest queries can
+    load arrays (and build a KD-tree) without re-parsing the JSON.
+    """
+    entries = _get_tree_entries(tree_points)
+    indices: list[int] = []
+    lats: list[float] = []
+    lons: list[float] = []
+    for item in entries:
+        try:
+            indices.append(int(item.get("tree_index", item.get("treeIndex"))))
+            lats.append(float(item["lat"]))
+            lons.append(float(item["lon"]))
+        except (TypeError, ValueError, KeyError):
+            continue
+    if not indices:
+        return
+    np.savez(
+        mission_dir / f"{mission_id}_kd.npz",
+        tree_index=np.asarray(indices, dtype=np.int64),
+        lat=np.asarray(lats, dtype=np.float64),
+        lon=np.asarray(lons, dtype=np.float64),
+    )
+
+
+_kdtree_cache: dict[str, tuple[int, Any]] = {}
+
+
+def _load_kdtree(mission_id: str):
+    """Load the persisted tree index for a mission, cached by file mtime.
+
+    Returns a cKDTree over (lat, lon) when scipy is available, otherwise
+    the raw coordinate array; None when no index was persisted.
+    """
+    index_path = Path("logs") / "missions" / f"{mission_id}_kd.npz"
+    try:
+        mtime = index_path.stat().st_mtime_ns
+    except OSError:
+        return None
+
+    cached = _kdtree_cache.get(mission_id)
+    if cached is not None and cached[0] == mtime:
+        return cached[1]
+
+    with np.load(index_path) as data:
+        coords = np.column_stack([data["lat"], data["lon"]])
+    try:
+        from scipy.spatial import cKDTree
+
+        index = cKDTree(coords)
+    except Exception:
+        index = coords
+    _kdtree_cache[mission_id] = (mtime, index)
+    return index
+
+
 def transcribe(path: str) -> str:
     provider = os.getenv("STT_PROVIDER", "openai").lower()
     if provider == "local":
@@ -371,12 +687,85 @@ def transcribe(path: str) -> str:
     return transcribe_openai(path)
 
 
-def transcribe_openai(path: str) -> str:
+def _pcm_to_wav_bytes(pcm: "np.ndarray") -> BytesIO:
+    """Wrap 16 kHz mono float32 PCM as an in-memory WAV file."""
+    import wave
+
+    samples = np.clip(pcm * 32768.0, -32768, 32767).astype(np.int16)
+    buf = BytesIO()
+    with wave.open(buf, "wb") as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(16000)
+        wav.writeframes(samples.tobytes())
+    buf.seek(0)
+    buf.name = "audio.wav"  # the SDK infers content type from the name
+    return buf
+
+
+def _get_openai_client() -> OpenAI:
+    """One shared client with a pooled keep-alive transport.
+
+    Client construction sets up an httpx.Client (TLS, DNS) and costs
+    ~100 ms; building it once means every transcription reuses warm
+    connections instead of handshaking per request.
+    """
     global _openai_client
     if _openai_client is None:
-        _openai_client = OpenAI()
+        with _openai_client_lock:
+            if _openai_client is None:
+                import httpx
+
+                _openai_client = OpenAI(
+                    http_client=httpx.Client(
+                        limits=httpx.Limits(
+                            max_keepalive_connections=32, max_connections=64
+                        )
+                    )
+                )
+    return _openai_client
+
+
+# formats the transcription API accepts as-is; anything here skips the
+# PCM decode entirely and is mmapped straight into the upload
+_PASSTHROUGH_AUDIO: dict[str, str] = {
+    ".mp3": "audio/mpeg",
+    ".wav": "audio/wav",
+}
+
+
+def transcribe_openai(path: str) -> str:
+    client = _get_openai_client()
+
+    suffix = Path(path).suffix.lower()
+    mime = _PASSTHROUGH_AUDIO.get(suffix)
+    if mime is not None:
+        with open(path, "rb") as f:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            transcript = client.audio.transcriptions.create(
+                model=os.getenv("STT_MODEL", "gpt-4o-mini-transcribe"),
+                file=(f"audio{suffix}", mm, mime),
+                prompt="The user is a farmer speaking instructions for an ag-tech robot.",
+            )
+            return transcript.text
+        finally:
+            mm.close()
+
+    # decode once in-process; WAV PCM uploads fine and skips any container
+    # quirks, with the original file as fallback when PyAV can't read it
+    pcm = _decode_audio_pcm(path)
+    if pcm is not None:
+        audio_file = _pcm_to_wav_bytes(pcm)
+        transcript = client.audio.transcriptions.create(
+            model=os.getenv("STT_MODEL", "gpt-4o-mini-transcribe"),
+            file=audio_file,
+            prompt="The user is a farmer speaking instructions for an ag-tech robot.",
+        )
+        return transcript.text
+
     with open(path, "rb") as audio_file:
-        transcript = _openai_client.audio.transcriptions.create(
+        transcript = client.audio.transcriptions.create(
             model=os.getenv("STT_MODEL", "gpt-4o-mini-transcribe"),
             file=audio_file,
             prompt="The user is a farmer speaking instructions for an ag-tech robot.",
@@ -384,62 +773,213 @@ def transcribe_openai(path: str) -> str:
         return transcript.text
 
 
-def transcribe_local(path: str) -> str:
-    global _whisper_model
+def _decode_audio_pcm(path: str):
+    """Decode audio in-process to 16 kHz mono float32 PCM via PyAV.
+
+    Returns None when PyAV cannot decode the file; callers fall back to
+    handing the file path to whisper directly.
+    """
     try:
+        import av
+        import numpy as np
+    except Exception as exc:
+        logger.debug("PyAV not available for in-process decode: %s", exc)
+        return None
+
+    try:
+        resampler = av.AudioResampler(format="s16", layout="mono", rate=16000)
+        planes = []
+        with av.open(path) as container:
+            for frame in container.decode(audio=0):
+                for resampled in resampler.resample(frame):
+                    planes.append(resampled.to_ndarray().reshape(-1))
+        if not planes:
+            return None
+        return np.concatenate(planes).astype(np.float32) / 32768.0
+    except Exception as exc:
+        logger.warning("In-process audio decode failed: %s", exc)
+        return None
+
+
+def _whisper_worker() -> None:
+    """Drain transcription requests through the single warm model.
+
+    Requests are pulled in micro-batches (up to 8 within a 20 ms window)
+    so concurrent /generate calls share one inference pass sequence
+    instead of contending for the model through the GIL.
+    """
+    assert _whisper_queue is not None
+    while True:
+        batch = [_whisper_queue.get()]
+        while len(batch) < 8:
+            try:
+                batch.append(_whisper_queue.get(timeout=0.02))
+            except queue.Empty:
+                break
+        for audio, fut in batch:
+            try:
+                # the batched pipeline parallelizes 30 s windows within one
+                # utterance; the plain model fallback takes no batch_size
+                if _whisper_pipeline is _whisper_model:
+                    segments, _info = _whisper_pipeline.transcribe(audio)
+                else:
+                    segments, _info = _whisper_pipeline.transcribe(audio, batch_size=8)
+                fut.set_result("".join(segment.text for segment in segments).strip())
+            except Exception as exc:  # propagate to the waiting request
+                fut.set_exception(exc)
+
+
+def _ensure_whisper_worker() -> None:
+    """Load the whisper model and start the worker thread once."""
+    global _whisper_model, _whisper_pipeline, _whisper_queue, _whisper_thread
+    with _whisper_lock:
+        if _whisper_thread is not None:
+            return
+
         from faster_whisper import WhisperModel
+
+        _whisper_model = WhisperModel(
+            os.getenv("WHISPER_MODEL", "small"),
+            device=os.getenv("WHISPER_DEVICE", "cpu"),
+            compute_type=os.getenv("WHISPER_COMPUTE_TYPE", "int8"),
+        )
+        try:
+            from faster_whisper import BatchedInferencePipeline
+
+            _whisper_pipeline = BatchedInferencePipeline(model=_whisper_model)
+        except Exception:
+            # older faster-whisper; plain sequential transcribe still works
+            _whisper_pipeline = _whisper_model
+
+        _whisper_queue = queue.Queue()
+        _whisper_thread = threading.Thread(
+            target=_whisper_worker, name="whisper-worker", daemon=True
+        )
+        _whisper_thread.start()
+
+
+def _split_pcm_on_silence(
+    pcm: "np.ndarray",
+    max_chunk_s: float = 300.0,
+    silence_threshold: float = 0.01,
+) -> list:
+    """Split long PCM into macro-chunks cut at silent boundaries.
+
+    Audio at or under max_chunk_s comes back as a single chunk. Longer
+    recordings are cut at the quietest 50 ms frame found in the back half
+    of each window so words are not clipped mid-chunk.
+    """
+    sample_rate = 16000
+    max_len = int(max_chunk_s * sample_rate)
+    if pcm.shape[0] <= max_len:
+        return [pcm]
+
+    frame = sample_rate // 20  # 50 ms frames
+    n_frames = pcm.shape[0] // frame
+    energy = np.abs(pcm[: n_frames * frame]).reshape(n_frames, frame).mean(axis=1)
+    silent = energy < silence_threshold
+
+    chunks = []
+    start = 0
+    while pcm.shape[0] - start > max_len:
+        lo = (start + max_len // 2) // frame
+        hi = min((start + max_len) // frame, n_frames)
+        candidates = np.flatnonzero(silent[lo:hi])
+        if candidates.size:
+            cut = (lo + candidates[-1]) * frame + frame // 2
+        else:
+            cut = start + max_len  # no silence found; hard cut
+        chunks.append(pcm[start:cut])
+        start = cut
+    chunks.append(pcm[start:])
+    return chunks
+
+
+def transcribe_local(path: str) -> str:
+    try:
+        _ensure_whisper_worker()
     except Exception as exc:
         logger.error("faster-whisper not available: %s", exc)
         raise
 
-    model_name = os.getenv("WHISPER_MODEL", "small")
-    device = os.getenv("WHISPER_DEVICE", "cpu")
-    compute_type = os.getenv("WHISPER_COMPUTE_TYPE", "int8")
+    assert _whisper_queue is not None
 
-    if _whisper_model is None:
-        _whisper_model = WhisperModel(
-            model_name,
-            device=device,
-            compute_type=compute_type,
-        )
+    # whisper wants 16 kHz PCM anyway; feed it directly when PyAV can decode
+    pcm = _decode_audio_pcm(path)
+    if pcm is None:
+        fut: Future = Future()
+        _whisper_queue.put((path, fut))
+        return fut.result()
 
-    segments, _info = _whisper_model.transcribe(path)
-    text = "".join(segment.text for segment in segments).strip()
-    return text
+    # long recordings go through the worker as independent macro-chunks so
+    # its micro-batching can overlap them; text is rejoined in order
+    futures: list[Future] = []
+    for chunk in _split_pcm_on_silence(pcm):
+        fut = Future()
+        _whisper_queue.put((chunk, fut))
+        futures.append(fut)
+    return " ".join(fut.result() for fut in futures).strip()
 
 
-@app.get("/")
-async def index():
+def _render_index() -> tuple[bytes, str] | None:
+    """Rendered index.html bytes + ETag, cached until any web asset changes."""
     index_path = WEB_DIR / "index.html"
-    if not index_path.exists():
-        return HTMLResponse(
-            "<h1>Missing web UI</h1><p>Expected app/web/index.html</p>",
-            status_code=404,
-        )
-    html = index_path.read_text(encoding="utf-8")
-
-    # Cache-bust static assets so mobile browsers pick up fresh JS/CSS after updates.
     css_path = WEB_DIR / "style.css"
     js_path = WEB_DIR / "app.js"
-    if css_path.exists():
-        css_version = int(css_path.stat().st_mtime)
+
+    def _mtime(path: Path) -> int:
+        try:
+            return path.stat().st_mtime_ns
+        except FileNotFoundError:
+            return 0
+
+    index_mtime = _mtime(index_path)
+    if index_mtime == 0:
+        return None
+    signature = (index_mtime, _mtime(css_path), _mtime(js_path))
+    cached = _scan_cache.get("index_html")
+    if cached is not None and cached[0] == signature:
+        return cached[1]
+
+    html = index_path.read_text(encoding="utf-8")
+    # Cache-bust static assets so mobile browsers pick up fresh JS/CSS after updates.
+    if signature[1]:
         html = html.replace(
             'href="/static/style.css"',
-            f'href="/static/style.css?v={css_version}"',
+            f'href="/static/style.css?v={signature[1] // 10**9}"',
         )
-    if js_path.exists():
-        js_version = int(js_path.stat().st_mtime)
+    if signature[2]:
         html = html.replace(
             'src="/static/app.js"',
-            f'src="/static/app.js?v={js_version}"',
+            f'src="/static/app.js?v={signature[2] // 10**9}"',
         )
 
+    body = html.encode("utf-8")
+    etag = f'"{hashlib.md5(body).hexdigest()}"'
+    rendered = (body, etag)
+    _scan_cache["index_html"] = (signature, rendered)
+    return rendered
+
+
+@app.get("/")
+async def index(request: Request):
+    rendered = _render_index()
+    if rendered is None:
+        return HTMLResponse(
+            "<h1>Missing web UI</h1><p>Expected app/web/index.html</p>",
+            status_code=404,
+        )
+    body, etag = rendered
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers={"ETag": etag})
+
     return HTMLResponse(
-        html,
+        body,
         headers={
-            "Cache-Control": "no-store, no-cache, must-revalidate, max-age=0",
-            "Pragma": "no-cache",
-            "Expires": "0",
+            # no-cache still forces revalidation, but matching ETags now
+            # short-circuit to a bodyless 304
+            "ETag": etag,
+            "Cache-Control": "no-cache",
         },
     )
 
@@ -460,7 +1000,7 @@ async def get_context_files():
         if not PROMPTS_DIR.exists():
             return {"files": [], "selected": selected_context}
 
-        files = sorted({path.name for path in PROMPTS_DIR.rglob("*") if path.is_file()})
+        files = _prompt_file_names()
         available_files = set(files)
 
         if isinstance(configured_context_files, list):
@@ -534,9 +1074,7 @@ async def get_schemas():
     try:
         if not SCHEMAS_DIR.exists():
             return {"schemas": []}
-        schemas = [p.stem for p in SCHEMAS_DIR.glob("*.xsd") if p.is_file()]
-        schemas.sort()
-        return {"schemas": schemas}
+        return {"schemas": _schema_names()}
     except Exception as e:
         logger.error(f"Error getting schemas: {e}")
         return {"schemas": []}
@@ -561,24 +1099,40 @@ def list_missions():
         return {"missions": []}
 
     missions = []
-    for request_file in mission_dir.glob("*_request.json"):
-        mission_id = request_file.name.replace("_request.json", "")
-        xml_file = mission_dir / f"{mission_id}_result.xml"
-        tree_file = mission_dir / f"{mission_id}_tree_points.json"
+    with os.scandir(mission_dir) as entries:
+        mission_files = {entry.name: entry for entry in entries if entry.is_file()}
+
+    for name, entry in mission_files.items():
+        if not name.endswith("_request.json"):
+            continue
+        mission_id = name[: -len("_request.json")]
         try:
-            with open(request_file, "r", encoding="utf-8") as f:
-                request_data = json.load(f)
+            stat_result = entry.stat()
+            cached = _mission_request_cache.get(entry.path)
+            if cached is not None and cached[0] == stat_result.st_mtime_ns:
+                request_data = cached[1]
+            else:
+                with open(entry.path, "rb") as f:
+                    request_data = orjson.loads(f.read())
+                _mission_request_cache[entry.path] = (
+                    stat_result.st_mtime_ns,
+                    request_data,
+                )
+            xml_name = f"{mission_id}_result.xml"
+            tree_name = f"{mission_id}_tree_points.json"
             missions.append(
                 {
                     "id": mission_id,
                     "prompt": request_data.get("text"),
-                    "createdAt": request_file.stat().st_mtime,
-                    "xmlFile": xml_file.name if xml_file.exists() else None,
-                    "treePointsFile": tree_file.name if tree_file.exists() else None,
+                    "createdAt": stat_result.st_mtime,
+                    "xmlFile": xml_name if xml_name in mission_files else None,
+                    "treePointsFile": (
+                        tree_name if tree_name in mission_files else None
+                    ),
                 }
             )
         except Exception as exc:
-            logger.warning("Failed reading mission %s: %s", request_file, exc)
+            logger.warning("Failed reading mission %s: %s", entry.path, exc)
 
     missions.sort(key=lambda m: m.get("createdAt", 0), reverse=True)
     return {"missions": missions}
@@ -599,12 +1153,19 @@ def get_mission(mission_id: str):
     tree_path = mission_dir / f"{mission_id}_tree_points.json"
     if tree_path.exists():
         try:
-            with open(tree_path, "r", encoding="utf-8") as f:
-                tree_points = json.load(f)
+            with open(tree_path, "rb") as f:
+                tree_points = orjson.loads(f.read())
             tree_points_payload = _build_tree_points_payload(tree_points)
             if tree_points_payload:
-                move_ids = _extract_move_to_tree_ids(result)
-                visit_points_payload = _build_visit_points(tree_points, move_ids)
+                visit_path = mission_dir / f"{mission_id}_visit_points.json"
+                if visit_path.exists():
+                    # visit points are persisted at mission save time; reuse
+                    # them instead of re-parsing the XML
+                    with open(visit_path, "rb") as f:
+                        visit_points_payload = orjson.loads(f.read()) or None
+                else:
+                    move_ids = _extract_move_to_tree_ids(result)
+                    visit_points_payload = _build_visit_points(tree_points, move_ids)
         except Exception as exc:
             logger.warning("Failed reading tree points for %s: %s", mission_id, exc)
 
@@ -629,8 +1190,8 @@ def send_mission(
     tree_path = mission_dir / f"{mission_id}_tree_points.json"
     if tree_path.exists():
         try:
-            with open(tree_path, "r", encoding="utf-8") as f:
-                tree_points = json.load(f)
+            with open(tree_path, "rb") as f:
+                tree_points = orjson.loads(f.read())
         except Exception as exc:
             logger.warning("Failed reading tree points for %s: %s", mission_id, exc)
 
@@ -673,6 +1234,8 @@ def delete_missions(payload: dict = Body(default={})):  # type: ignore
             mission_dir / f"{mission_id}_request.json",
             mission_dir / f"{mission_id}_result.xml",
             mission_dir / f"{mission_id}_tree_points.json",
+            mission_dir / f"{mission_id}_visit_points.json",
+            mission_dir / f"{mission_id}_kd.npz",
         ]
         removed_any = False
         for file_path in files:
@@ -694,12 +1257,14 @@ def delete_missions(payload: dict = Body(default={})):  # type: ignore
 async def generate(request: str = Form(...), file: UploadFile = File(None)):
     async def _generate():
         now = time.time()
-        data = json.loads(request)
-        print("data:", data)
+        data = orjson.loads(request)
+        logger.debug("data: %s", data)
         text = data.get("text")
         log_entry = {
             "timestamp": now,
-            "request": request,
+            # store the parsed dict, not the raw string: the log writer
+            # serializes the whole entry, and JSON-inside-JSON escapes twice
+            "request": data,
         }
 
         save_mission = data.get("saveMission", data.get("saveAudio", True))
@@ -709,33 +1274,33 @@ async def generate(request: str = Form(...), file: UploadFile = File(None)):
         mission_id = f"{int(now)}_{uuid.uuid4().hex[:8]}"
 
         if file:
-            audio_data = await file.read()
             suffix = _infer_audio_suffix(file)
-            temp_fd, temp_path = tempfile.mkstemp(suffix=suffix)
-            try:
-                with os.fdopen(temp_fd, "wb") as temp_file:
-                    temp_file.write(audio_data)
-                    temp_file.flush()
+            # all audio scratch lives in one temp dir wiped on exit; no
+            # manual remove/exists bookkeeping, nothing leaks on error
+            with tempfile.TemporaryDirectory(prefix="stt_") as scratch_dir:
+                temp_path = os.path.join(scratch_dir, f"in{suffix}")
 
-                mp3_path = _convert_to_mp3(temp_path)
-                try:
-                    transcript = transcribe(mp3_path)
-                finally:
-                    if mp3_path != temp_path and os.path.exists(mp3_path):
-                        os.remove(mp3_path)
-                    yield json.dumps({"stt": transcript}) + "\n"
+                # copy the upload to disk in 1 MiB chunks off the event loop
+                # instead of slurping the whole blob into memory
+                def _write_upload() -> None:
+                    with open(temp_path, "wb") as temp_file:
+                        shutil.copyfileobj(file.file, temp_file, length=1 << 20)
+
+                await anyio.to_thread.run_sync(_write_upload)
+
+                # both STT paths decode the upload in-process; no ffmpeg
+                # re-encode round trip
+                transcript = await anyio.to_thread.run_sync(transcribe, temp_path)
+                yield orjson.dumps({"stt": transcript}) + b"\n"
 
                 if save_mission:
-                    log_fname = f"{mission_id}_{Path(temp_path).name}"
+                    log_fname = f"{mission_id}{suffix}"
                     log_path = Path("logs") / "audio" / log_fname
                     log_path.parent.mkdir(parents=True, exist_ok=True)
-                    shutil.copy2(temp_path, log_path)
-            finally:
-                if os.path.exists(temp_path):
-                    os.remove(temp_path)
+                    await anyio.to_thread.run_sync(shutil.copy2, temp_path, log_path)
 
             if not transcript or not transcript.strip():
-                yield json.dumps({"error": "No speech detected"}) + "\n"
+                yield orjson.dumps({"error": "No speech detected"}) + b"\n"
                 return
 
             text = transcript
@@ -743,7 +1308,7 @@ async def generate(request: str = Form(...), file: UploadFile = File(None)):
                 log_entry["audioFile"] = log_fname
 
         if not text:
-            yield json.dumps({"error": "Missing text input"}) + "\n"
+            yield orjson.dumps({"error": "Missing text input"}) + b"\n"
             return
 
         if text:
@@ -753,10 +1318,6 @@ async def generate(request: str = Form(...), file: UploadFile = File(None)):
         context_vars: dict | None = None
         request_farm_polygon = mission_cfg.get("farm", {}).get("polygon")
 
-        ltl: bool = bool(validation_cfg.get("ltl_enabled", False))
-        pml_template_path: str = str(verification_cfg.get("promela_template", ""))
-        spin_path: str = str(verification_cfg.get("spin_path", ""))
-
         try:
             if "contextFiles" in data:
                 # Handle contextFiles as a list of filenames
@@ -782,7 +1343,7 @@ async def generate(request: str = Form(...), file: UploadFile = File(None)):
                             )
                         continue
 
-                    matches = [p for p in PROMPTS_DIR.rglob(filename) if p.is_file()]
+                    matches = _prompt_file_index().get(filename, [])
                     if not matches:
                         logger.warning(f"Requested context file not found: {filename}")
                         continue
@@ -795,7 +1356,7 @@ async def generate(request: str = Form(...), file: UploadFile = File(None)):
                     context_files.append(str(matches[0].resolve()))
 
             else:
-                context_files.extend(mission_cfg.get("context_files", []))
+                context_files.extend(SERVER_CONFIG.context_files)
 
             requested_farm_polygon_file = data.get("farmPolygonFile")
             if isinstance(requested_farm_polygon_file, str):
@@ -804,33 +1365,32 @@ async def generate(request: str = Form(...), file: UploadFile = File(None)):
                 requested_farm_polygon_file = ""
 
             if requested_farm_polygon_file:
-                farm_polygon, farm_polygon_path = _load_farm_polygon(
+                # file read + YAML parse; keep it off the event loop
+                farm_polygon, farm_polygon_path = await anyio.to_thread.run_sync(
+                    _load_farm_polygon,
                     requested_farm_polygon_file,
                     str(CONFIG_PATH),
-                    enforce_farm_dir=True,
+                    True,
                 )
                 if farm_polygon is None:
                     yield (
-                        json.dumps(
+                        orjson.dumps(
                             {
                                 "error": "Invalid farm selection: "
                                 f"{requested_farm_polygon_file}"
                             }
                         )
-                        + "\n"
+                        + b"\n"
                     )
                     return
                 request_farm_polygon = farm_polygon
                 logger.debug("Using requested farm polygon file: %s", farm_polygon_path)
 
             if request_farm_polygon:
-                tpg = TreePlacementGenerator(
-                    request_farm_polygon["points"],
-                    request_farm_polygon["dimensions"],
-                    perimeter_margin_m=request_farm_polygon.get(
-                        "perimeter_margin_m", 5.0
-                    ),
-                    traversal_axis=request_farm_polygon.get("traversal_axis", "row"),
+                # cached per polygon; first build (pyproj + geometry setup)
+                # still runs off the event loop
+                tpg = await anyio.to_thread.run_sync(
+                    _get_tree_placement_generator, request_farm_polygon
                 )
                 context_vars = {
                     "farm_polygon": request_farm_polygon,
@@ -843,68 +1403,27 @@ async def generate(request: str = Form(...), file: UploadFile = File(None)):
                     "No farm polygon found. Assuming we're not dealing with an orchard grid..."
                 )
 
-            lint_xml = data.get("lintXml", validation_cfg.get("lint_xml", True))
-            if ltl and not (pml_template_path and spin_path):
-                ltl = False
-                logger.warning(
-                    "No spin configuration found. Proceeding without formal verification..."
-                )
-
-            routing_mode = str(routing_cfg.get("mode", "online")).lower()
-            online_model = str(routing_cfg["online_model"])
-            offline_model = routing_cfg.get("offline_model")
-            online_api_base = endpoints_cfg.get("online_api_base")
-            offline_api_base = endpoints_cfg.get("offline_api_base")
-
-            if routing_mode == "auto":
-                selected_model = online_model
-                selected_api_base = online_api_base
-                auto_toggle = True
-                local_model = offline_model
-                local_api_base = offline_api_base
-            elif routing_mode == "online":
-                selected_model = online_model
-                selected_api_base = online_api_base
-                auto_toggle = False
-                local_model = None
-                local_api_base = None
-            elif routing_mode == "offline":
-                if offline_model is None:
-                    logger.warning(
-                        "llm.routing.mode=offline but no offline_model provided. Falling back to online_model."
-                    )
-                selected_model = offline_model or online_model
-                selected_api_base = offline_api_base
-                auto_toggle = False
-                local_model = None
-                local_api_base = None
-            else:
-                raise ValueError(
-                    "Invalid llm.routing.mode '%s'. Supported values: auto, online, offline"
-                    % routing_mode
-                )
+            # everything static comes precomputed from SERVER_CONFIG; only
+            # the schema and the lintXml override are per request
+            lint_xml = data.get("lintXml", SERVER_CONFIG.lint_xml)
 
             planner_config = MissionPlannerConfig(
-                token_path=config_yaml["auth"]["token_env_file"],
+                token_path=SERVER_CONFIG.token_path,
                 schema_paths=[f"schemas/{data['schema']}.xsd"],
                 lint_xml=lint_xml,
-                max_retries=int(planner_cfg["retries"]["max"]),
-                max_tokens=int(generation_cfg["max_tokens"]),
-                temperature=float(generation_cfg["temperature"]),
-                ltl=ltl,
-                promela_template_path=pml_template_path,
-                spin_path=spin_path,
-                log_directory=mission_cfg["log_directory"],
-                model_routing=ModelRoutingConfig(
-                    model=selected_model,
-                    api_base=selected_api_base,
-                    auto_model_toggle=auto_toggle,
-                    local_model=local_model,
-                    local_api_base=local_api_base,
-                ),
+                max_retries=SERVER_CONFIG.max_retries,
+                max_tokens=SERVER_CONFIG.max_tokens,
+                temperature=SERVER_CONFIG.temperature,
+                ltl=SERVER_CONFIG.ltl,
+                promela_template_path=SERVER_CONFIG.pml_template_path,
+                spin_path=SERVER_CONFIG.spin_path,
+                log_directory=SERVER_CONFIG.log_directory,
+                model_routing=SERVER_CONFIG.model_routing,
             )
 
-            mp = MissionPlanner(
+            # MissionPlanner.__init__ reads token and context files from disk
+            mp = await anyio.to_thread.run_sync(
+                MissionPlanner,
                 planner_config,
                 context_files,
                 tpg,
@@ -914,9 +1433,23 @@ async def generate(request: str = Form(...), file: UploadFile = File(None)):
         except yaml.YAMLError as exc:
             logger.error(f"Improper YAML config: {exc}")
 
-        file_xml_out = mp.run(text)
-        with open(file_xml_out, "r") as f:
-            result = f.read()
+        # the LLM round-trips and file reads below block; keep them off the
+        # event loop so concurrent /generate calls interleave
+        file_xml_out = await anyio.to_thread.run_sync(mp.run, text)
+
+        # the planner keeps the final XML in memory; only fall back to
+        # re-reading the written file if that attribute is missing
+        result = getattr(mp, "last_xml", None)
+        if result is None:
+
+            def _read_result() -> bytes:
+                with open(file_xml_out, "rb") as f:
+                    return f.read()
+
+            result_bytes = await anyio.to_thread.run_sync(_read_result)
+            result = result_bytes.decode("utf-8")
+        else:
+            result_bytes = result.encode("utf-8")
 
         tree_points_payload = None
         visit_points_payload = None
@@ -925,47 +1458,62 @@ async def generate(request: str = Form(...), file: UploadFile = File(None)):
             move_ids = _extract_move_to_tree_ids(result)
             visit_points_payload = _build_visit_points(mp.tree_points, move_ids)
 
-        try:
-            tcp_host = data.get("tcpHost") or network_cfg.get("host", "127.0.0.1")
-            tcp_port_raw = data.get("tcpPort") or network_cfg.get("port", 12345)
-            tcp_port = int(tcp_port_raw)
-            nic = NetworkInterface(logger, tcp_host, tcp_port)
-            nic.init_socket()
-            tree_points = (
-                mp.tree_points
-                if hasattr(mp, "tree_points") and mp.tree_points
-                else None
-            )
-            nic.send_file(file_xml_out, tree_points)
-            nic.close_socket()
-        except Exception as exc:
-            logger.warning("TCP send failed: %s", exc)
+        # fire the TCP hand-off in the background so the client gets the
+        # streamed response without waiting on the robot link
+        async def _send_mission() -> None:
+            try:
+                tcp_host = data.get("tcpHost") or SERVER_CONFIG.tcp_host
+                tcp_port = int(data.get("tcpPort") or SERVER_CONFIG.tcp_port)
+                nic = NetworkInterface(logger, tcp_host, tcp_port)
+                tree_points = (
+                    mp.tree_points
+                    if hasattr(mp, "tree_points") and mp.tree_points
+                    else None
+                )
+                await nic.send_bytes_async(result_bytes, tree_points)
+            except Exception as exc:
+                logger.warning("TCP send failed: %s", exc)
+
+        send_task = asyncio.create_task(_send_mission())
+        _background_tasks.add(send_task)
+        send_task.add_done_callback(_background_tasks.discard)
 
         log_entry["response"] = result
 
         mission_meta = None
         if save_mission:
             mission_dir = Path("logs") / "missions"
-            mission_dir.mkdir(parents=True, exist_ok=True)
 
-            request_path = mission_dir / f"{mission_id}_request.json"
-            with open(request_path, "w", encoding="utf-8") as f:
-                json.dump(data, f, indent=2)
+            def _persist_mission() -> tuple[Path, Path, Path | None]:
+                mission_dir.mkdir(parents=True, exist_ok=True)
+
+                request_path = mission_dir / f"{mission_id}_request.json"
+                with open(request_path, "wb") as f:
+                    f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2))
 
-            xml_path = mission_dir / f"{mission_id}_result.xml"
-            with open(xml_path, "w", encoding="utf-8") as f:
-                f.write(result)
+                xml_path = mission_dir / f"{mission_id}_result.xml"
+                xml_path.write_bytes(result_bytes)
 
-            tree_points = (
-                mp.tree_points
-                if hasattr(mp, "tree_points") and mp.tree_points
-                else None
+                tree_points = (
+                    mp.tree_points
+                    if hasattr(mp, "tree_points") and mp.tree_points
+                    else None
+                )
+                tree_path = None
+                if tree_points is not None:
+                    tree_path = mission_dir / f"{mission_id}_tree_points.json"
+                    with open(tree_path, "wb") as f:
+                        f.write(orjson.dumps(tree_points, option=orjson.OPT_INDENT_2))
+                    _save_tree_index(mission_dir, mission_id, tree_points)
+                if visit_points_payload:
+                    visit_path = mission_dir / f"{mission_id}_visit_points.json"
+                    with open(visit_path, "wb") as f:
+                        f.write(orjson.dumps(visit_points_payload))
+                return request_path, xml_path, tree_path
+
+            request_path, xml_path, tree_path = await anyio.to_thread.run_sync(
+                _persist_mission
             )
-            tree_path = None
-            if tree_points is not None:
-                tree_path = mission_dir / f"{mission_id}_tree_points.json"
-                with open(tree_path, "w", encoding="utf-8") as f:
-                    json.dump(tree_points, f, indent=2)
 
             log_entry["mission"] = {
                 "id": mission_id,
@@ -981,9 +1529,7 @@ async def generate(request: str = Form(...), file: UploadFile = File(None)):
                 "treePointsFile": tree_path.name if tree_path else None,
             }
 
-        os.makedirs("logs", exist_ok=True)
-        with open("logs/requests.log", "a") as f:
-            f.write(json.dumps(log_entry) + "\n")
+        _enqueue_request_log(log_entry)
 
         payload = {"result": result}
         if tree_points_payload:
@@ -992,7 +1538,7 @@ async def generate(request: str = Form(...), file: UploadFile = File(None)):
             payload["visitPoints"] = visit_points_payload
         if mission_meta:
             payload["mission"] = mission_meta
-        yield json.dumps(payload) + "\n"
+        yield orjson.dumps(payload) + b"\n"
 
     return StreamingResponse(
         _generate(),
@@ -5,11 +5,27 @@ This module provides functionality to place trees within a polygon area
 using coordinate transformations between WGS84 and UTM projections.
 """
 
+from functools import lru_cache
 from typing import Tuple
 
 from pyproj import Transformer
 
 
+@lru_cache(maxsize=32)
+def _make_transformer(src_epsg: int, dst_epsg: int) -> Transformer:
+    """Build (and memoize) a Transformer between two EPSG codes.
+
+    Transformer construction parses the CRS database and initializes PROJ
+    contexts — hundreds of ms each — while only a handful of (src, dst)
+    pairs ever occur.
+    """
+    return Transformer.from_crs(
+        f"{CoordinateSystem.EPSG_PREFIX}{src_epsg}",
+        f"{CoordinateSystem.EPSG_PREFIX}{dst_epsg}",
+        always_xy=True,
+    )
+
+
 class CoordinateSystem:
     """Handles coordinate transformations between different EPSG systems."""
 
@@ -26,40 +42,78 @@ class CoordinateSystem:
             target_epsg: Target EPSG code for UTM projection (default: 32610 for UTM Zone 10N)
         """
         self.target_epsg = target_epsg
-        self._to_utm_transformer = Transformer.from_crs(
-            f"{self.EPSG_PREFIX}{self.WGS84}",
-            f"{self.EPSG_PREFIX}{target_epsg}",
-            always_xy=True,
-        )
-        self._from_utm_transformer = Transformer.from_crs(
-            f"{self.EPSG_PREFIX}{target_epsg}",
-            f"{self.EPSG_PREFIX}{self.WGS84}",
-            always_xy=True,
-        )
-
-    def latlon_to_xy(self, lat: float, lon: float) -> Tuple[float, float]:
+        self._to_utm_transformer = _make_transformer(self.WGS84, target_epsg)
+        self._from_utm_transformer = _make_transformer(target_epsg, self.WGS84)
+
+    def latlon_to_xy(self, lat, lon) -> Tuple:
         """
         Convert latitude/longitude to UTM coordinates.
 
+        pyproj transforms are polymorphic: scalars return scalar tuples
+        and ndarrays are processed in one vectorized C call.
+
         Args:
-            lat: Latitude in decimal degrees
-            lon: Longitude in decimal degrees
+            lat: Latitude in decimal degrees (scalar or array-like)
+            lon: Longitude in decimal degrees (scalar or array-like)
 
         Returns:
             Tuple of (x, y) coordinates in UTM projection
         """
         return self._to_utm_transformer.transform(lon, lat)
 
-    def xy_to_latlon(self, x: float, y: float) -> Tuple[float, float]:
+    def xy_to_latlon(self, x, y) -> Tuple:
         """
         Convert UTM coordinates to latitude/longitude.
 
+        Accepts scalars or array-likes, mirroring latlon_to_xy.
+
         Args:
-            x: X coordinate in UTM projection
-            y: Y coordinate in UTM projection
+            x: X coordinate in UTM projection (scalar or array-like)
+            y: Y coordinate in UTM projection (scalar or array-like)
 
         Returns:
             Tuple of (lat, lon) in decimal degrees
         """
         lon, lat = self._from_utm_transformer.transform(x, y)
         return lat, lon
+
+    def latlon_to_xy_many(self, lats, lons) -> Tuple:
+        """
+        Convert arrays of latitudes/longitudes to UTM coordinates.
+
+        Args:
+            lats: Array-like of latitudes in decimal degrees
+            lons: Array-like of longitudes in decimal degrees
+
+        Returns:
+            Tuple of (xs, ys) arrays in UTM projection
+        """
+        return self._to_utm_transformer.transform(lons, lats)
+
+    def xy_to_latlon_many(self, xs, ys) -> Tuple:
+        """
+        Convert arrays of UTM coordinates to latitudes/longitudes.
+
+        Args:
+            xs: Array-like of X coordinates in UTM projection
+            ys: Array-like of Y coordinates in UTM projection
+
+        Returns:
+            Tuple of (lats, lons) arrays in decimal degrees
+        """
+        lons, lats = self._from_utm_transformer.transform(xs, ys)
+        return lats, lons
+
+
+def latlon_to_xy(lat, lon, target_epsg: int = CoordinateSystem.UTMZ10N) -> Tuple:
+    """Module-level transform using the shared transformer cache.
+
+    Skips CoordinateSystem construction entirely for one-off callers.
+    """
+    return _make_transformer(CoordinateSystem.WGS84, target_epsg).transform(lon, lat)
+
+
+def xy_to_latlon(x, y, target_epsg: int = CoordinateSystem.UTMZ10N) -> Tuple:
+    """Inverse module-level transform; see latlon_to_xy."""
+    lon, lat = _make_transformer(target_epsg, CoordinateSystem.WGS84).transform(x, y)
+    return lat, lon
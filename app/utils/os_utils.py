@@ -1,3 +1,4 @@
+from functools import lru_cache
 from typing import Tuple
 from pathlib import Path
 import tempfile
@@ -9,42 +10,52 @@ from jinja2 import Environment, FileSystemLoader
 
 
 def execute_shell_cmd(command: list) -> Tuple[int, str]:
-    ret: int = 0
-    out: str = ""
+    # text=True decodes once; the old str(check_output(...)) returned the
+    # bytes repr ("b'...'") with every newline escape-coded
+    result = subprocess.run(command, capture_output=True, text=True, check=False)
+    out: str = result.stdout if result.returncode == 0 else result.stderr
 
-    try:
-        out = str(subprocess.check_output(command))
-    except subprocess.CalledProcessError as err:
-        ret = err.returncode
-        out = str(err.output)
-
-    return ret, out
+    return result.returncode, out
 
 
 def write_out_file(dir: str, mp_out: str | None) -> str:
     assert isinstance(mp_out, str)
 
-    # Create a temporary file in the specified directory
-    with tempfile.NamedTemporaryFile(dir=dir, delete=False, mode="w") as temp_file:
+    # mkstemp + fchmod sets permissions on the open fd, so we skip the
+    # extra path lookup of a post-close os.chmod and there is no window
+    # where the file exists with the default 0600 mode
+    fd, temp_file_name = tempfile.mkstemp(dir=dir, text=True)
+    os.fchmod(fd, stat.S_IRWXU | stat.S_IRWXG | stat.S_IRWXO)
+    with os.fdopen(fd, "w") as temp_file:
         temp_file.write(mp_out)
-        # name of temp file output
-        temp_file_name = temp_file.name
-        temp_file.close()
-
-    os.chmod(temp_file_name, stat.S_IRWXU | stat.S_IRWXG | stat.S_IRWXO)
 
     return temp_file_name
 
 
+@lru_cache(maxsize=16)
+def _template_env(parent: str) -> Environment:
+    # Environments are heavy to build (loader, filter registration) but
+    # thread-safe to share; one per template directory is plenty, and the
+    # env's own template cache then kicks in for repeated renders
+    return Environment(
+        loader=FileSystemLoader(parent),
+        trim_blocks=True,
+    )
+
+
+@lru_cache(maxsize=64)
+def _read_static_file(path: str, mtime_ns: int) -> str:
+    # mtime_ns keys the cache so edits on disk invalidate naturally
+    with open(path, "r") as f:
+        return f.read()
+
+
 def read_file(path: str, variables: dict | None = None) -> str:
     if path.endswith(".j2"):
         template_path = Path(path)
-        env = Environment(
-            loader=FileSystemLoader(template_path.parent),
-            trim_blocks=True,
+        template = _template_env(str(template_path.parent)).get_template(
+            template_path.name
         )
-        template = env.get_template(template_path.name)
         return template.render(**(variables or {}))
 
-    with open(path, "r") as f:
-        return f.read()
+    return _read_static_file(path, os.stat(path).st_mtime_ns)
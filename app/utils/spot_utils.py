@@ -4,14 +4,23 @@ import spot
 
 import re
 
+# compiled once; these run per LLM response
+_LTL_HEAD = re.compile(r"^ltl\s+\w+\s*{")
+_LTL_TAIL = re.compile(r"}\s*$")
+_DEFINE_MATCH = re.compile(r"\(.*?==")
 
-def regex_spin_to_spot(expression: str) -> str:
-    # --- Step 1: Strip 'ltl <label> {' and trailing '}' ---
+
+def _strip_ltl_wrapper(expression: str) -> str:
+    """Strip the 'ltl <label> {' header and trailing '}' from a formula."""
     expression = expression.strip()
-    expression = re.sub(r"^ltl\s+\w+\s*{", "", expression).strip()
-    expression = re.sub(r"}\s*$", "", expression).strip()
+    expression = _LTL_HEAD.sub("", expression).strip()
+    return _LTL_TAIL.sub("", expression).strip()
+
+
+def regex_spin_to_spot(expression: str) -> str:
+    expression = _strip_ltl_wrapper(expression)
 
-    # --- Step 2: Wrap in <> if not already ---
+    # --- Wrap in <> if not already ---
     if not expression.startswith("<>"):
         expression = f"<>({expression})"
 
@@ -19,10 +28,7 @@ def regex_spin_to_spot(expression: str) -> str:
 
 
 def add_init_state(expression: str) -> str:
-    # --- Step 1: Strip 'ltl <label> {' and trailing '}' ---
-    expression = expression.strip()
-    expression = re.sub(r"^ltl\s+\w+\s*{", "", expression).strip()
-    expression = re.sub(r"}\s*$", "", expression).strip()
+    expression = _strip_ltl_wrapper(expression)
 
     expression = f"init && X ({expression})"
 
@@ -33,7 +39,7 @@ def init_state_macro(macros: str) -> str:
     # ensure that the initial state is defined in the LTL macros
     updated_macros: str = ""
     if "#define init" not in macros:
-        match = re.search(r"\(.*?==", macros)
+        match = _DEFINE_MATCH.search(macros)
         if match is not None:
             first_line = match.group(0)
             init_macro = "#define init " + first_line + " 0)\n"
@@ -42,20 +48,18 @@ def init_state_macro(macros: str) -> str:
 
 
 def generate_accepting_run_string(aut) -> str:
+    # the BDD dict is invariant for the automaton; fetch it once
+    bdd_dict = aut.get_dict()
     curr = aut.get_init_state_number()
     path = []
     while not aut.state_is_accepting(curr):
-        edges = [e for e in aut.out(curr)]
-
-        next = curr
-        while next == curr:
-            sel_e = random.choice(edges)
-            next = sel_e.dst
-
-        # move
-        curr = next
+        # filter self-loops up front instead of rejection-sampling them,
+        # which looped forever when every edge was a self-loop
+        edges = [e for e in aut.out(curr) if e.dst != curr]
+        sel_e = random.choice(edges)
+        curr = sel_e.dst
 
-        path.append(spot.bdd_format_formula(aut.get_dict(), sel_e.cond))
+        path.append(spot.bdd_format_formula(bdd_dict, sel_e.cond))
 
     return " ".join(path)
 
@@ -1,34 +1,62 @@
+import os
+import re
+from functools import lru_cache
 from typing import Tuple
 
 from lxml import etree
 
 from app.xml_types import AttributeTags, ControlTags, ActionTags
 
+# shared parser: mission documents carry no DTDs and we never look
+# elements up by ID, so skip entity resolution and ID collection
+_XML_PARSER = etree.XMLParser(collect_ids=False, resolve_entities=False)
+
+# search paths built once instead of per count_xml_tasks call
+_FALLBACK_PATH = ".//" + ControlTags.Fallback
+_ACTION_PATHS = tuple(".//" + a for a in ActionTags)
+
 
 def parse_schema_location(xml_mp: str) -> str:
-    root: etree._Element = etree.fromstring(xml_mp)
+    root: etree._Element = etree.fromstring(xml_mp, _XML_PARSER)
     location = root.attrib[AttributeTags.SchemaLocation]
     return location
 
 
+# fence patterns compiled per code type; an unterminated block still
+# matches to end-of-string like the old double split did
+_CODE_BLOCK_RES: dict[str, re.Pattern] = {}
+
+
 def parse_code(mp_out: str | None, code_type: str = "xml") -> str:
     assert isinstance(mp_out, str)
 
-    xml_response: str = mp_out.split("```" + code_type + "\n")[1]
-    xml_response = xml_response.split("```")[0]
+    pattern = _CODE_BLOCK_RES.get(code_type)
+    if pattern is None:
+        pattern = re.compile(
+            r"```" + re.escape(code_type) + r"\n(.*?)(?:```|$)", re.DOTALL
+        )
+        _CODE_BLOCK_RES[code_type] = pattern
+
+    match = pattern.search(mp_out)
+    if match is None:
+        raise ValueError(f"No ```{code_type} code block found in response.")
+
+    return match.group(1)
+
 
-    return xml_response
+@lru_cache(maxsize=8)
+def _load_schema(schema_path: str, mtime_ns: int) -> etree.XMLSchema:
+    # mtime_ns keys the cache so schema edits on disk invalidate naturally
+    return etree.XMLSchema(etree.parse(schema_path))
 
 
 def validate_output(schema_path: str, xml_mp: str) -> Tuple[bool, str]:
     try:
-        # Parse the XSD file
-        with open(schema_path, "rb") as schema_file:
-            schema_root = etree.XML(schema_file.read())
-        schema = etree.XMLSchema(schema_root)
+        # schema compilation dominates validation; reuse the compiled object
+        schema = _load_schema(schema_path, os.stat(schema_path).st_mtime_ns)
 
         # Parse the XML file
-        root: etree._Element = etree.fromstring(xml_mp)
+        root: etree._Element = etree.fromstring(xml_mp, _XML_PARSER)
 
         # Validate the XML file against the XSD schema
         schema.assertValid(root)
@@ -42,22 +70,20 @@ def validate_output(schema_path: str, xml_mp: str) -> Tuple[bool, str]:
 
 def count_xml_tasks(xml_mp: str):
     # Parse the XML file
-    root: etree._Element = etree.fromstring(xml_mp)
+    root: etree._Element = etree.fromstring(xml_mp, _XML_PARSER)
     task_count: int = 0
 
     # we're parsing before validation, so be careful
     bt: etree._Element = root.find(ControlTags.BehaviorTree)
 
-    fallback: etree._Element = (
-        bt.findall(".//" + ControlTags.Fallback) if bt is not None else None
-    )
+    fallback: etree._Element = bt.findall(_FALLBACK_PATH) if bt is not None else None
 
     # count Conditionals only under Fallbacks
     for fb in fallback:
         task_count += len(fb.findall(ControlTags.Sequence))
 
     # count Actions
-    for a in ActionTags:
-        task_count += len(root.findall(".//" + a))
+    for path in _ACTION_PATHS:
+        task_count += len(root.findall(path))
 
     return task_count
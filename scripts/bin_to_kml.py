@@ -11,63 +11,152 @@ polygon around all points.
 from __future__ import annotations
 
 import argparse
-import json
+import mmap
 import struct
 from pathlib import Path
-from typing import Any, Iterable
-from xml.etree.ElementTree import Element, SubElement, tostring
+from typing import Any, Iterable, Iterator
 import math
-from xml.dom.minidom import parseString
 
+import numpy as np
+
+# compiled once; avoids re-parsing the format string per message
+_U32 = struct.Struct("!I")
+
+# constant KML prologue; nothing in it varies per mission
+_KML_HEADER = """\
+<?xml version="1.0" encoding="UTF-8"?>
+<kml xmlns="http://www.opengis.net/kml/2.2">
+  <Document>
+    <Style id="treeStyle">
+      <IconStyle>
+        <Icon>
+          <href>http://maps.google.com/mapfiles/kml/shapes/target.png</href>
+        </Icon>
+        <color>ff0000ff</color>
+        <scale>1.1</scale>
+      </IconStyle>
+    </Style>
+    <Style id="perimeterStyle">
+      <IconStyle>
+        <Icon>
+          <href>http://maps.google.com/mapfiles/kml/shapes/donut.png</href>
+        </Icon>
+        <color>ff00a5ff</color>
+        <scale>0.9</scale>
+      </IconStyle>
+    </Style>
+    <Style id="rowWaypointStyle">
+      <IconStyle>
+        <Icon>
+          <href>http://maps.google.com/mapfiles/kml/shapes/placemark_circle.png</href>
+        </Icon>
+        <color>ff00ff00</color>
+        <scale>0.7</scale>
+      </IconStyle>
+    </Style>
+    <Style id="boundaryStyle">
+      <LineStyle>
+        <color>ffff0000</color>
+        <width>2</width>
+      </LineStyle>
+      <PolyStyle>
+        <color>330000ff</color>
+      </PolyStyle>
+    </Style>
+"""
+
+_KML_FOOTER = """\
+  </Document>
+</kml>
+"""
+
+
+# one fixed %-format template per placemark; names and styles are generated
+# here, never user text, so no escaping. 7 decimals is ~1 cm of latitude —
+# all GPS coordinates carry, and fixed precision formats faster than
+# shortest-repr while keeping the output compact.
+_POINT_PLACEMARK_FMT = """\
+    <Placemark>
+      <name>%s %d</name>
+      <styleUrl>%s</styleUrl>
+      <Point>
+        <coordinates>%.7f,%.7f,0</coordinates>
+      </Point>
+    </Placemark>
+"""
+
+_RING_COORD_FMT = "%.7f,%.7f,0"
 
-def read_length_prefixed_chunks(file_path: Path) -> list[bytes]:
-    chunks: list[bytes] = []
+# orjson parses straight from bytes, skipping the utf-8 decode pass; keep a
+# stdlib fallback so the script still runs outside the app environment
+try:
+    import orjson
+
+    _loads = orjson.loads
+except ImportError:
+    import json
+
+    def _loads(data: Any) -> Any:
+        # stdlib json cannot parse a memoryview directly
+        return json.loads(bytes(data))
+
+
+def read_length_prefixed_chunks(file_path: Path) -> Iterator[memoryview]:
+    """Yield payload slices straight out of a memory-mapped file.
+
+    One mapping replaces the two read() copies per message; the slices are
+    zero-copy views, so each payload is only materialized by the JSON parser.
+    """
     with file_path.open("rb") as f:
-        while True:
-            header = f.read(4)
-            if len(header) < 4:
-                break
-            length = struct.unpack("!I", header)[0]
-            if length <= 0:
-                break
-            payload = f.read(length)
-            if len(payload) < length:
-                break
-            chunks.append(payload)
-    return chunks
+        try:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # empty file cannot be mapped
+            return
+    # no explicit close: the mapping is released once the yielded slices
+    # and the mmap object are garbage-collected
+    view = memoryview(mm)
+    offset = 0
+    end = len(view)
+    while offset + 4 <= end:
+        length = _U32.unpack_from(view, offset)[0]
+        offset += 4
+        if length <= 0 or end - offset < length:
+            break
+        yield view[offset : offset + length]
+        offset += length
 
 
 def iter_json_payloads_from_bin(file_path: Path) -> Iterable[Any]:
     for chunk in read_length_prefixed_chunks(file_path):
         try:
-            decoded = chunk.decode("utf-8")
-        except UnicodeDecodeError:
-            continue
-        try:
-            data = json.loads(decoded)
-        except json.JSONDecodeError:
+            # bytes go straight to the parser; bad utf-8 and bad JSON both
+            # surface as ValueError, preserving skip-on-bad-chunk semantics
+            data = _loads(chunk)
+        except ValueError:
             continue
         yield data
 
 
 def iter_json_payloads_from_json_file(file_path: Path) -> Iterable[Any]:
-    with file_path.open("r", encoding="utf-8") as f:
-        data = json.load(f)
-    yield data
-
-
-def is_point_dict(item: Any) -> bool:
-    return isinstance(item, dict) and ("lat" in item and "lon" in item)
+    yield _loads(file_path.read_bytes())
 
 
 def extract_tree_and_waypoints(
     payloads: Iterable[Any],
 ) -> tuple[
-    list[dict[str, Any]],
+    np.ndarray,
+    np.ndarray,
     list[tuple[float, float]],
     list[tuple[float, float]],
 ]:
-    best_points: list[dict[str, Any]] = []
+    """Return tree lats/lons as float64 arrays plus row/perimeter waypoints.
+
+    Tree coordinates are parsed to floats exactly once here; downstream
+    consumers work on the arrays instead of re-reading the payload dicts.
+    """
+    tree_lats: list[float] = []
+    tree_lons: list[float] = []
     row_waypoints: list[tuple[float, float]] = []
     perimeter_waypoints: list[tuple[float, float]] = []
     row_waypoint_seen: set[tuple[float, float]] = set()
@@ -78,12 +167,25 @@ def extract_tree_and_waypoints(
         candidate_points = data.get("trees")
         if not isinstance(candidate_points, list):
             continue
-        points = [item for item in candidate_points if is_point_dict(item)]
+        # test inlined in the comprehension — no per-item function call, and
+        # the exact type check is cheaper than isinstance for plain dicts
+        points = [
+            item
+            for item in candidate_points
+            if type(item) is dict and "lat" in item and "lon" in item
+        ]
         if not points:
             continue
-        best_points = points
 
-        for tree in best_points:
+        for tree in points:
+            try:
+                lat = float(tree["lat"])
+                lon = float(tree["lon"])
+            except (TypeError, ValueError):
+                lat = lon = None
+            if lat is not None and lon is not None:
+                tree_lats.append(lat)
+                tree_lons.append(lon)
             candidate_row_waypoints = tree.get("row_waypoints")
             if not isinstance(candidate_row_waypoints, list):
                 continue
@@ -114,170 +216,180 @@ def extract_tree_and_waypoints(
                     continue
         break
 
-    return best_points, row_waypoints, perimeter_waypoints
+    return (
+        np.asarray(tree_lats, dtype=np.float64),
+        np.asarray(tree_lons, dtype=np.float64),
+        row_waypoints,
+        perimeter_waypoints,
+    )
 
 
-def apply_offset(
-    lat: float, lon: float, north_m: float, east_m: float
-) -> tuple[float, float]:
+def apply_offset_all(
+    lats: np.ndarray, lons: np.ndarray, north_m: float, east_m: float
+) -> tuple[np.ndarray, np.ndarray]:
+    """Offset whole coordinate arrays at once; identity when offsets are zero."""
     if not north_m and not east_m:
-        return lat, lon
+        return lats, lons
     # Approximate conversion using spherical Earth
     r = 6378137.0
-    dlat = north_m / r
-    dlon = east_m / (r * math.cos(math.radians(lat)))
-    return lat + math.degrees(dlat), lon + math.degrees(dlon)
+    dlat = math.degrees(north_m / r)
+    dlons = np.degrees(east_m / (r * np.cos(np.radians(lats))))
+    return lats + dlat, lons + dlons
 
 
 def collect_all_points(
-    tree_points: list[dict[str, Any]],
+    tree_lats: np.ndarray,
+    tree_lons: np.ndarray,
     row_waypoints: list[tuple[float, float]],
     perimeter_waypoints: list[tuple[float, float]],
 ) -> list[tuple[float, float]]:
-    points: list[tuple[float, float]] = []
-    for item in tree_points:
-        try:
-            points.append((float(item["lat"]), float(item["lon"])))
-        except (TypeError, ValueError, KeyError):
-            continue
+    points = list(zip(tree_lats.tolist(), tree_lons.tolist()))
     points.extend(row_waypoints)
     points.extend(perimeter_waypoints)
     return points
 
 
+def _akl_toussaint_prune(arr: np.ndarray) -> np.ndarray:
+    """Drop points strictly inside the quadrilateral of the four extremes.
+
+    Akl-Toussaint preconditioning: interior points can never be hull
+    vertices, and on dense grids the extreme-point quadrilateral covers
+    most of the cloud. Points on the quad's edges survive the strict
+    test, so degenerate (collinear) extreme sets prune nothing and stay
+    correct. Row order — and thus the lexicographic sort — is preserved.
+    """
+    quad = arr[
+        [
+            arr[:, 0].argmin(),
+            arr[:, 1].argmin(),
+            arr[:, 0].argmax(),
+            arr[:, 1].argmax(),
+        ]
+    ]
+    inside = np.ones(arr.shape[0], dtype=bool)
+    for i in range(4):
+        ax, ay = quad[i]
+        bx, by = quad[(i + 1) % 4]
+        # strictly left of each CCW edge means strictly inside
+        inside &= (bx - ax) * (arr[:, 1] - ay) - (by - ay) * (arr[:, 0] - ax) > 0
+    return arr[~inside]
+
+
 def convex_hull(points: list[tuple[float, float]]) -> list[tuple[float, float]]:
     # Monotonic chain for (lat, lon) points
     if len(points) < 3:
         return points
 
-    pts = sorted(set(points))
-
-    def cross(o, a, b):
-        return (a[0] - o[0]) * (b[1] - o[1]) - (a[1] - o[1]) * (b[0] - o[0])
-
-    lower = []
-    for p in pts:
-        while len(lower) >= 2 and cross(lower[-2], lower[-1], p) <= 0:
+    # np.unique sorts rows lexicographically and dedupes in one C pass,
+    # replacing the Python-level sorted(set(...)) — the O(n log n) part
+    arr = np.unique(np.asarray(points, dtype=np.float64), axis=0)
+    if arr.shape[0] > 16:
+        arr = _akl_toussaint_prune(arr)
+    pts = list(map(tuple, arr.tolist()))
+
+    # cross product inlined in the stack loops; only the O(n) pop/push
+    # pass stays in Python
+    lower: list[tuple[float, float]] = []
+    for px, py in pts:
+        while len(lower) >= 2:
+            ox, oy = lower[-2]
+            ax, ay = lower[-1]
+            if (ax - ox) * (py - oy) - (ay - oy) * (px - ox) > 0:
+                break
             lower.pop()
-        lower.append(p)
-
-    upper = []
-    for p in reversed(pts):
-        while len(upper) >= 2 and cross(upper[-2], upper[-1], p) <= 0:
+        lower.append((px, py))
+
+    upper: list[tuple[float, float]] = []
+    for px, py in reversed(pts):
+        while len(upper) >= 2:
+            ox, oy = upper[-2]
+            ax, ay = upper[-1]
+            if (ax - ox) * (py - oy) - (ay - oy) * (px - ox) > 0:
+                break
             upper.pop()
-        upper.append(p)
+        upper.append((px, py))
 
-    hull = lower[:-1] + upper[:-1]
-    return hull
+    return lower[:-1] + upper[:-1]
 
 
-def build_kml(
-    tree_points: list[dict[str, Any]],
+def iter_kml_chunks(
+    tree_lats: np.ndarray,
+    tree_lons: np.ndarray,
     row_waypoints: list[tuple[float, float]],
     perimeter_waypoints: list[tuple[float, float]],
     polygon_points: list[tuple[float, float]],
     offset_north_m: float,
     offset_east_m: float,
-) -> str:
-    kml = Element("kml", xmlns="http://www.opengis.net/kml/2.2")
-    document = SubElement(kml, "Document")
-
-    # Styles
-    tree_style = SubElement(document, "Style", id="treeStyle")
-    tree_icon_style = SubElement(tree_style, "IconStyle")
-    tree_icon = SubElement(tree_icon_style, "Icon")
-    SubElement(tree_icon, "href").text = (
-        "http://maps.google.com/mapfiles/kml/shapes/target.png"
-    )
-    SubElement(tree_icon_style, "color").text = "ff0000ff"
-    SubElement(tree_icon_style, "scale").text = "1.1"
-
-    perimeter_style = SubElement(document, "Style", id="perimeterStyle")
-    perimeter_icon_style = SubElement(perimeter_style, "IconStyle")
-    perimeter_icon = SubElement(perimeter_icon_style, "Icon")
-    SubElement(perimeter_icon, "href").text = (
-        "http://maps.google.com/mapfiles/kml/shapes/donut.png"
-    )
-    SubElement(perimeter_icon_style, "color").text = "ff00a5ff"
-    SubElement(perimeter_icon_style, "scale").text = "0.9"
-
-    row_waypoint_style = SubElement(document, "Style", id="rowWaypointStyle")
-    row_waypoint_icon_style = SubElement(row_waypoint_style, "IconStyle")
-    row_waypoint_icon = SubElement(row_waypoint_icon_style, "Icon")
-    SubElement(row_waypoint_icon, "href").text = (
-        "http://maps.google.com/mapfiles/kml/shapes/placemark_circle.png"
-    )
-    SubElement(row_waypoint_icon_style, "color").text = "ff00ff00"
-    SubElement(row_waypoint_icon_style, "scale").text = "0.7"
-
-    poly_style = SubElement(document, "Style", id="boundaryStyle")
-    line = SubElement(poly_style, "LineStyle")
-    SubElement(line, "color").text = "ffff0000"
-    SubElement(line, "width").text = "2"
-    poly = SubElement(poly_style, "PolyStyle")
-    SubElement(poly, "color").text = "330000ff"
-
-    # Tree points
-    for idx, item in enumerate(tree_points, start=1):
-        try:
-            lat = float(item["lat"])
-            lon = float(item["lon"])
-        except (TypeError, ValueError, KeyError):
-            continue
-        lat, lon = apply_offset(lat, lon, offset_north_m, offset_east_m)
-        placemark = SubElement(document, "Placemark")
-        name = SubElement(placemark, "name")
-        name.text = f"Tree {idx}"
-        SubElement(placemark, "styleUrl").text = "#treeStyle"
-        point = SubElement(placemark, "Point")
-        SubElement(point, "coordinates").text = f"{lon},{lat},0"
+) -> Iterator[str]:
+    # Yield the document as string chunks so the caller can stream them to
+    # disk; the full KML never has to sit in memory at once
+    yield _KML_HEADER
+
+    # Tree points arrive pre-parsed as float64 arrays; offset them in one
+    # vectorized pass, then emit placemarks
+    if tree_lats.size:
+        lats, lons = apply_offset_all(
+            tree_lats, tree_lons, offset_north_m, offset_east_m
+        )
+        for idx, (lat, lon) in enumerate(zip(lats, lons), start=1):
+            yield _POINT_PLACEMARK_FMT % ("Tree", idx, "#treeStyle", lon, lat)
 
     # Perimeter waypoints
-    for idx, (lat, lon) in enumerate(perimeter_waypoints, start=1):
-        lat, lon = apply_offset(lat, lon, offset_north_m, offset_east_m)
-        placemark = SubElement(document, "Placemark")
-        name = SubElement(placemark, "name")
-        name.text = f"Perimeter Waypoint {idx}"
-        SubElement(placemark, "styleUrl").text = "#perimeterStyle"
-        point = SubElement(placemark, "Point")
-        SubElement(point, "coordinates").text = f"{lon},{lat},0"
+    if perimeter_waypoints:
+        arr = np.asarray(perimeter_waypoints, dtype=np.float64)
+        lats, lons = apply_offset_all(
+            arr[:, 0], arr[:, 1], offset_north_m, offset_east_m
+        )
+        for idx, (lat, lon) in enumerate(zip(lats, lons), start=1):
+            yield _POINT_PLACEMARK_FMT % (
+                "Perimeter Waypoint",
+                idx,
+                "#perimeterStyle",
+                lon,
+                lat,
+            )
 
     # Row waypoints (between adjacent trees in a row)
-    for idx, (lat, lon) in enumerate(row_waypoints, start=1):
-        lat, lon = apply_offset(lat, lon, offset_north_m, offset_east_m)
-        placemark = SubElement(document, "Placemark")
-        name = SubElement(placemark, "name")
-        name.text = f"Row Waypoint {idx}"
-        SubElement(placemark, "styleUrl").text = "#rowWaypointStyle"
-        point = SubElement(placemark, "Point")
-        SubElement(point, "coordinates").text = f"{lon},{lat},0"
+    if row_waypoints:
+        arr = np.asarray(row_waypoints, dtype=np.float64)
+        lats, lons = apply_offset_all(
+            arr[:, 0], arr[:, 1], offset_north_m, offset_east_m
+        )
+        for idx, (lat, lon) in enumerate(zip(lats, lons), start=1):
+            yield _POINT_PLACEMARK_FMT % (
+                "Row Waypoint",
+                idx,
+                "#rowWaypointStyle",
+                lon,
+                lat,
+            )
 
     # Boundary polygon
     if len(polygon_points) >= 3:
-        placemark = SubElement(document, "Placemark")
-        SubElement(placemark, "name").text = "Boundary"
-        SubElement(placemark, "styleUrl").text = "#boundaryStyle"
-        polygon = SubElement(placemark, "Polygon")
-        SubElement(polygon, "tessellate").text = "1"
-        outer = SubElement(polygon, "outerBoundaryIs")
-        ring = SubElement(outer, "LinearRing")
-        coords = SubElement(ring, "coordinates")
-        coord_lines = []
-        for lat, lon in polygon_points:
-            lat, lon = apply_offset(lat, lon, offset_north_m, offset_east_m)
-            coord_lines.append(f"{lon},{lat},0")
-        # close ring
-        first_lat, first_lon = apply_offset(
-            polygon_points[0][0],
-            polygon_points[0][1],
-            offset_north_m,
-            offset_east_m,
+        # close the ring by repeating the first vertex before offsetting
+        arr = np.asarray(polygon_points + polygon_points[:1], dtype=np.float64)
+        lats, lons = apply_offset_all(
+            arr[:, 0], arr[:, 1], offset_north_m, offset_east_m
+        )
+        coord_lines = "\n".join(
+            _RING_COORD_FMT % (lon, lat) for lat, lon in zip(lats, lons)
+        )
+        yield (
+            "    <Placemark>\n"
+            "      <name>Boundary</name>\n"
+            "      <styleUrl>#boundaryStyle</styleUrl>\n"
+            "      <Polygon>\n"
+            "        <tessellate>1</tessellate>\n"
+            "        <outerBoundaryIs>\n"
+            "          <LinearRing>\n"
+            f"            <coordinates>\n{coord_lines}\n</coordinates>\n"
+            "          </LinearRing>\n"
+            "        </outerBoundaryIs>\n"
+            "      </Polygon>\n"
+            "    </Placemark>\n"
         )
-        coord_lines.append(f"{first_lon},{first_lat},0")
-        coords.text = "\n" + "\n".join(coord_lines) + "\n"
 
-    rough = tostring(kml, "utf-8")
-    return parseString(rough).toprettyxml(indent="  ")
+    yield _KML_FOOTER
 
 
 def main() -> int:
@@ -304,32 +416,38 @@ def main() -> int:
     if not input_path.exists():
         raise SystemExit(f"Input file not found: {input_path}")
 
+    # keep the payload stream lazy: extract_tree_and_waypoints stops at the
+    # first payload with tree points, so later chunks are never parsed
     if input_path.suffix.lower() == ".json":
-        payloads = list(iter_json_payloads_from_json_file(input_path))
+        payloads = iter_json_payloads_from_json_file(input_path)
     else:
-        payloads = list(iter_json_payloads_from_bin(input_path))
+        payloads = iter_json_payloads_from_bin(input_path)
 
-    tree_points, row_waypoints, perimeter_waypoints = extract_tree_and_waypoints(
-        payloads
+    tree_lats, tree_lons, row_waypoints, perimeter_waypoints = (
+        extract_tree_and_waypoints(payloads)
     )
-    if not tree_points and not row_waypoints and not perimeter_waypoints:
+    if not tree_lats.size and not row_waypoints and not perimeter_waypoints:
         raise SystemExit(
             "No tree points, row waypoints, or perimeter entrances found in input."
         )
 
-    all_points = collect_all_points(tree_points, row_waypoints, perimeter_waypoints)
-    hull = convex_hull(all_points)
-    kml_content = build_kml(
-        tree_points,
-        row_waypoints,
-        perimeter_waypoints,
-        hull,
-        args.offset_north_m,
-        args.offset_east_m,
+    all_points = collect_all_points(
+        tree_lats, tree_lons, row_waypoints, perimeter_waypoints
     )
-
+    hull = convex_hull(all_points)
     output_path = Path(args.output)
-    output_path.write_text(kml_content, encoding="utf-8")
+    with output_path.open("w", encoding="utf-8") as f:
+        f.writelines(
+            iter_kml_chunks(
+                tree_lats,
+                tree_lons,
+                row_waypoints,
+                perimeter_waypoints,
+                hull,
+                args.offset_north_m,
+                args.offset_east_m,
+            )
+        )
     return 0
 
 
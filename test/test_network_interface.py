@@ -18,6 +18,9 @@ sys.path.insert(0, str(Path(__file__).parent.parent / "app"))
 
 from network_interface import NetworkInterface
 
+# compiled once; avoids re-parsing the format string per received message
+_U32 = struct.Struct("!I")
+
 
 class MockServer:
     """Simple mock server to receive and validate messages."""
@@ -32,6 +35,9 @@ class MockServer:
         self.received_messages = []
         self.thread = None
         self.running = False
+        # set once the client connection has been fully drained, so tests
+        # can wait on it instead of sleeping a fixed interval
+        self.done = threading.Event()
 
     def _receive_length_prefixed_data(self, client_socket):
         """Receive a single length-prefixed message."""
@@ -40,21 +46,28 @@ class MockServer:
         if len(length_data) < 4:
             return None
 
-        length = struct.unpack("!I", length_data)[0]
+        length = _U32.unpack(length_data)[0]
 
-        # Read exact payload
-        data = b""
-        while len(data) < length:
-            chunk = client_socket.recv(min(4096, length - len(data)))
-            if not chunk:
-                break
-            data += chunk
+        # Read exact payload into a preallocated buffer; recv_into avoids
+        # the quadratic bytes += reallocation for large messages
+        buf = bytearray(length)
+        view = memoryview(buf)
+        received = 0
+        while received < length:
+            n = client_socket.recv_into(view[received:], length - received)
+            if not n:
+                return None
+            received += n
 
-        return data if len(data) == length else None
+        return bytes(buf)
 
     def _accept_connection(self):
         """Accept connection and receive all messages."""
-        client_socket, _ = self.server_socket.accept()
+        try:
+            client_socket, _ = self.server_socket.accept()
+        except OSError:
+            # listening socket closed during teardown while re-armed
+            return
 
         # Receive messages until connection closes or no more data
         while self.running:
@@ -64,6 +77,7 @@ class MockServer:
             self.received_messages.append(data)
 
         client_socket.close()
+        self.done.set()
 
     def start(self):
         """Start server in background thread."""
@@ -72,24 +86,38 @@ class MockServer:
         self.thread.daemon = True
         self.thread.start()
 
+    def reset(self):
+        """Clear state and re-arm the accept loop for the next client."""
+        if self.thread and self.thread.is_alive():
+            self.thread.join(timeout=1)
+        self.received_messages.clear()
+        self.done.clear()
+        self.start()
+
     def stop(self):
         """Stop server and close socket."""
         self.running = False
+        self.server_socket.close()
         if self.thread:
             self.thread.join(timeout=1)
-        self.server_socket.close()
 
 
-@pytest.fixture
-def test_server():
-    """Fixture providing a test server."""
+@pytest.fixture(scope="module")
+def _server():
+    """One MockServer per module; bind/listen happens once."""
     server = MockServer()
-    server.start()
     yield server
     server.stop()
 
 
 @pytest.fixture
+def test_server(_server):
+    """Fixture providing the shared test server, reset between tests."""
+    _server.reset()
+    return _server
+
+
+@pytest.fixture(scope="module")
 def logger():
     """Fixture providing a logger."""
     logging.basicConfig(level=logging.INFO)
@@ -124,10 +152,8 @@ def test_send_xml_only(test_server, logger, sample_xml_file):
     nic.send_file(sample_xml_file, tree_points=None)
     nic.close_socket()
 
-    # Give server time to receive
-    import time
-
-    time.sleep(0.1)
+    # Wait until the server has drained the connection
+    assert test_server.done.wait(timeout=2)
 
     # Verify only one message received (XML)
     assert len(test_server.received_messages) == 1
@@ -170,9 +196,7 @@ def test_send_xml_and_compact_tree_payload(test_server, logger, sample_xml_file)
     nic.send_file(sample_xml_file, tree_points=compact_payload)
     nic.close_socket()
 
-    import time
-
-    time.sleep(0.1)
+    assert test_server.done.wait(timeout=2)
 
     assert len(test_server.received_messages) == 2
     json_data = test_server.received_messages[1]
@@ -183,6 +207,40 @@ def test_send_xml_and_compact_tree_payload(test_server, logger, sample_xml_file)
     assert "row_to_entrance_indices" in decoded_payload
 
 
+def test_send_file_async(test_server, logger, sample_xml_file):
+    """Test async sendfile path produces the same framed messages."""
+    import asyncio
+
+    nic = NetworkInterface(logger, test_server.host, test_server.port)
+    asyncio.run(
+        nic.send_file_async(sample_xml_file, tree_points={"trees": [{"lat": 1.0}]})
+    )
+
+    assert test_server.done.wait(timeout=2)
+
+    assert len(test_server.received_messages) == 2
+    assert b"<Mission>" in test_server.received_messages[0]
+    decoded_payload = json.loads(test_server.received_messages[1].decode("utf-8"))
+    assert "trees" in decoded_payload
+
+
+def test_send_bytes(test_server, logger):
+    """Test sending an in-memory buffer matches the framed protocol."""
+    payload = b"<Mission><MoveToTreeID>1</MoveToTreeID></Mission>"
+
+    nic = NetworkInterface(logger, test_server.host, test_server.port)
+    nic.init_socket()
+    nic.send_bytes(payload, tree_points={"trees": [{"lat": 1.0}]})
+    nic.close_socket()
+
+    assert test_server.done.wait(timeout=2)
+
+    assert len(test_server.received_messages) == 2
+    assert test_server.received_messages[0] == payload
+    decoded_payload = json.loads(test_server.received_messages[1].decode("utf-8"))
+    assert "trees" in decoded_payload
+
+
 def test_length_prefix_correctness(test_server, logger, sample_xml_file):
     """Test that length prefixes are correct."""
     # Create network interface
@@ -197,10 +255,8 @@ def test_length_prefix_correctness(test_server, logger, sample_xml_file):
     nic.send_file(sample_xml_file, tree_points=None)
     nic.close_socket()
 
-    # Give server time to receive
-    import time
-
-    time.sleep(0.1)
+    # Wait until the server has drained the connection
+    assert test_server.done.wait(timeout=2)
 
     # Verify received data matches original
     assert len(test_server.received_messages) == 1